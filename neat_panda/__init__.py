@@ -9,16 +9,40 @@ __version__ = "0.9.8.1"
 from neat_panda._tidy import spread, gather, flatten_pivot
 
 # from ._caretaker import clean_column_names, _clean_column_names
-from neat_panda._caretaker import clean_column_names, CleanColumnNames, clean_strings
+from neat_panda._caretaker import (
+    clean_column_names,
+    CleanColumnNames,
+    ColumnNameCleaner,
+    ColumnNameMapping,
+    clean_strings,
+    clean_column_names_cache_info,
+    clean_column_names_cache_clear,
+)
+
+from neat_panda._readers import read_csv_clean, read_excel_clean, read_parquet_clean
 
 from neat_panda._set_operations import (
     difference,
     intersection,
     symmetric_difference,
     union,
+    union_all,
+    intersection_all,
+    difference_all,
+    diff,
     SetOperations,
 )
 
+from neat_panda._partitioned import PartitionedSetOperations
+
+from neat_panda._set_index import SetIndex
+
+from neat_panda._sketch import sketch, Sketch
+
+from neat_panda._bloom import BloomFilter
+
+from neat_panda._incremental import IncrementalDifference, IncrementalUnion
+
 from neat_panda._helpers import _get_version_from_toml
 
 from neat_panda._clipboard_wsl import read_clipboard_wsl, to_clipboard_wsl
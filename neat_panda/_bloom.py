@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+
+import json
+import math
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Union
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from ._helpers import (
+    _stable_fingerprints,
+    _mix_fingerprints,
+    _align_dtypes,
+    _row_fingerprints,
+    _isin_rows,
+    _unique_rows,
+)
+
+
+@dataclass(eq=False)
+class BloomFilter:
+    """A Bloom filter of the rows (or keys) of a reference that is too large to be held in memory, used to compute
+    set operations between small batches and the reference.
+
+    The filter is built incrementally, one chunk of the reference at a time, and takes about 10 bits per reference
+    row for a false positive rate of 1%. A row of a batch that is not in the filter is certainly not in the
+    reference. The few rows that pass the filter are candidates, which difference and intersection verify exactly
+    against the reference in one streaming pass, that is skipped if there are no candidates.
+
+    The rows are fingerprinted independently of the dtypes of the chunks, e.g. a column may be int64 in one chunk
+    and float64 in another. Use BloomFilter.create to create an empty filter and BloomFilter.load to load a saved
+    filter.
+
+    Parameters
+    ----------
+    bits : np.ndarray\n
+        The bits of the filter, packed into an uint8 array
+    n_hashes : int\n
+        The number of bits set per row
+    on : Optional[List[str]], default None\n
+        The key columns that are filtered. By default None, i.e. entire rows are filtered.
+    columns : Optional[List[str]], default None\n
+        The columns of the reference, set by the first chunk that is added
+    """
+
+    bits: np.ndarray
+    n_hashes: int
+    on: Optional[List[str]] = None
+    columns: Optional[List[str]] = None
+
+    @classmethod
+    def create(
+        cls, capacity: int, error_rate: float = 0.01, on: Optional[List[str]] = None
+    ) -> "BloomFilter":
+        """Creates an empty filter sized for the expected number of distinct reference rows.
+
+        Parameters
+        ----------
+        capacity : int\n
+            The expected number of distinct rows (or keys) of the reference. The false positive rate grows if more
+            rows are added.
+        error_rate : float, default 0.01\n
+            The false positive rate at capacity, between 0 and 1
+        on : Optional[List[str]], default None\n
+            Key columns that identify a row. By default None, i.e. entire rows are filtered.
+
+        Returns
+        -------
+        BloomFilter\n
+
+        Raises
+        ------
+        ValueError\n
+            Raises ValueError if capacity is not positive or error_rate is not between 0 and 1.
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be a positive integer")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        n_bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        n_hashes = max(1, round(n_bits / capacity * math.log(2)))
+        return cls(
+            bits=np.zeros((n_bits + 7) // 8, dtype=np.uint8),
+            n_hashes=n_hashes,
+            on=list(on) if on else None,
+        )
+
+    def add(self, chunk: pd.DataFrame) -> "BloomFilter":
+        """Adds the rows of a chunk of the reference to the filter, which is updated in place.
+
+        Parameters
+        ----------
+        chunk : pd.DataFrame\n
+
+        Returns
+        -------
+        BloomFilter\n
+            The filter itself
+
+        Raises
+        ------
+        ValueError\n
+            Raises ValueError if the filter is built on entire rows and the columns of the chunk are not those of
+            the chunks added before.
+        KeyError\n
+            Raises KeyError if any of the key columns is not a column of the chunk.
+        """
+        if self.columns is None:
+            self.columns = chunk.columns.to_list()
+        keys = self._keys(chunk)
+        if len(keys):
+            positions = self._positions(keys).ravel()
+            np.bitwise_or.at(
+                self.bits,
+                positions >> np.uint64(3),
+                np.left_shift(1, positions & np.uint64(7)).astype(np.uint8),
+            )
+        return self
+
+    def contains(self, batch: pd.DataFrame) -> np.ndarray:
+        """Returns a boolean mask over the rows of the batch that pass the filter, i.e. that may be in the
+        reference. The rows that do not pass are certainly not in the reference.
+
+        Parameters
+        ----------
+        batch : pd.DataFrame\n
+            A dataframe with the same columns as the reference, or at least the key columns if the filter was built
+            with on.
+
+        Returns
+        -------
+        np.ndarray\n
+            A boolean array with one element per row of the batch
+        """
+        keys = self._keys(batch)
+        if not len(keys):
+            return np.zeros(0, dtype=bool)
+        positions = self._positions(keys)
+        bits = self.bits[positions >> np.uint64(3)] >> (positions & np.uint64(7)).astype(
+            np.uint8
+        )
+        return (bits & 1).astype(bool).all(axis=0)
+
+    def difference(
+        self,
+        batch: pd.DataFrame,
+        reference: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+    ) -> pd.DataFrame:
+        """The rows of the batch that are not in the reference. Duplicate rows of the batch are dropped.
+
+        Only the rows that pass the filter are verified against the reference, which is read once, and not at all
+        if no row passes. Does not alter the original DataFrame.
+
+        Parameters
+        ----------
+        batch : pd.DataFrame\n
+            See contains
+        reference : Union[pd.DataFrame, Iterable[pd.DataFrame]]\n
+            The reference the filter was built from, as a dataframe or an iterable of chunks, e.g. the result of
+            pandas.read_csv with chunksize
+
+        Returns
+        -------
+        pd.DataFrame\n
+            The set difference between the batch and the reference
+        """
+        return batch[~self._verified(batch, reference) & _unique_rows(batch)]
+
+    def intersection(
+        self,
+        batch: pd.DataFrame,
+        reference: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+    ) -> pd.DataFrame:
+        """The rows of the batch that are in the reference. Duplicate rows of the batch are dropped.
+
+        Only the rows that pass the filter are verified against the reference, which is read once, and not at all
+        if no row passes. Does not alter the original DataFrame.
+
+        Parameters
+        ----------
+        batch : pd.DataFrame\n
+            See contains
+        reference : Union[pd.DataFrame, Iterable[pd.DataFrame]]\n
+            See difference
+
+        Returns
+        -------
+        pd.DataFrame\n
+            The set intersection between the batch and the reference
+        """
+        return batch[self._verified(batch, reference) & _unique_rows(batch)]
+
+    def save(self, path: Any) -> None:
+        """Saves the filter to a directory. The bits are stored as a .npy file, which load can map into memory, and
+        the other attributes as json.
+
+        Parameters
+        ----------
+        path : Any\n
+            The directory, which is created if it does not exist
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        np.save(path / "bits.npy", self.bits)
+        with open(path / "bloom.json", "w") as f:
+            json.dump(
+                {"n_hashes": self.n_hashes, "on": self.on, "columns": self.columns}, f
+            )
+
+    @classmethod
+    def load(cls, path: Any, mmap: bool = False) -> "BloomFilter":
+        """Loads a filter saved by BloomFilter.save.
+
+        Parameters
+        ----------
+        path : Any\n
+            The directory of the filter
+        mmap : bool, default False\n
+            If True, the bits are memory mapped read only, i.e. they are not read into memory, but the loaded filter
+            can not be added to.
+
+        Returns
+        -------
+        BloomFilter\n
+        """
+        path = Path(path)
+        with open(path / "bloom.json", "r") as f:
+            metadata = json.load(f)
+        bits = np.load(path / "bits.npy", mmap_mode="r" if mmap else None)
+        return cls(bits=bits, **metadata)
+
+    def _keys(self, df: pd.DataFrame) -> pd.DataFrame:
+        if not self.on:
+            if self.columns is not None and df.columns.to_list() != self.columns:
+                raise ValueError(
+                    "The columns of the dataframe must be identical to the columns of the reference."
+                )
+            return df
+        missing = [column for column in self.on if column not in df.columns]
+        if missing:
+            raise KeyError(
+                f"The following key columns are not found in the dataframe: {', '.join(map(str, missing))}"
+            )
+        return df[self.on]
+
+    def _positions(self, keys: pd.DataFrame) -> np.ndarray:
+        """Returns the n_hashes bit positions of each row, an array of shape (n_hashes, len(keys)). The positions
+        are derived from two independent hashes (double hashing).
+        """
+        fingerprints = _stable_fingerprints(keys)
+        first = _mix_fingerprints(fingerprints, 0)
+        second = _mix_fingerprints(fingerprints, 1) | np.uint64(1)
+        steps = np.arange(self.n_hashes, dtype=np.uint64)[:, None]
+        return (first + steps * second) % np.uint64(len(self.bits) * 8)
+
+    def _verified(
+        self,
+        batch: pd.DataFrame,
+        reference: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+    ) -> np.ndarray:
+        """Returns a boolean mask over the rows of the batch that are in the reference. The rows that pass the
+        filter are looked up exactly in each chunk of the reference, until all of them are found.
+        """
+        found = np.zeros(len(batch), dtype=bool)
+        candidates = np.flatnonzero(self.contains(batch))
+        if not len(candidates):
+            return found
+        keys = self._keys(batch).iloc[candidates]
+        chunks = [reference] if isinstance(reference, pd.DataFrame) else reference
+        for chunk in chunks:
+            left, right = _align_dtypes(keys, self._keys(chunk))
+            matched = _isin_rows(
+                left, right, _row_fingerprints(left), _row_fingerprints(right)
+            )
+            found[candidates[matched]] = True
+            candidates, keys = candidates[~matched], keys[~matched]
+            if not len(candidates):
+                break
+        return found
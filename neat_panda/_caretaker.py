@@ -1,10 +1,16 @@
 # -*- coding: utf-8 -*-
 
 import re
+import ast
+import json
+import string
 from dataclasses import dataclass
+from types import MappingProxyType
 from collections import Counter
-from typing import Union, List, Dict, Optional
+from functools import lru_cache
+from typing import Union, List, Dict, Optional, Callable, Tuple
 
+import numpy as np
 import pandas as pd
 import pandas_flavor as pf
 
@@ -16,7 +22,7 @@ def clean_strings(
     basic_cleaning: bool = True,
     convert_duplicates: bool = True,
     custom_transformation: Optional[Dict[str, str]] = None,
-    custom_expressions: Optional[List[str]] = None,
+    custom_expressions: Optional[List[Union[str, Callable[[str], str]]]] = None,
 ):
     return CleanColumnNames(
         object_,
@@ -36,13 +42,14 @@ def clean_column_names(
     basic_cleaning: bool = True,
     convert_duplicates: bool = True,
     custom_transformation: Optional[Dict[str, str]] = None,
-    custom_expressions: Optional[List[str]] = None,
+    custom_expressions: Optional[List[Union[str, Callable[[str], str]]]] = None,
+    cache: bool = False,
 ):
     """Clean messy column names. Inspired by the functions make_clean_names and clean_names from
     the R package janitor.
 
     Do not alter the columns of the original DataFrame, i.e. to change the column names of the dataframe df 'df=df.clean_column_names()'
-    should be used.
+    should be used. The returned DataFrame is a shallow copy that shares its data with the original DataFrame, i.e. no data is copied.
 
     Parameters
     ----------
@@ -66,10 +73,14 @@ def clean_column_names(
         /{'!':'$'/}. Use with caution if the custom_expressions parameter is used since the custom_expressions parameter
         is evaluated after the custom_transformation parameter.
         Cannot be used together with basic_cleaning, i.e. to use custom transformations basic_cleaning must be set to False.\n
+        Keys may be longer than one character. All replacements are made simultaneously in one pass, i.e. the result of one
+        replacement is never replaced again, and where keys overlap the longest key wins.\n
         By default None
-    custom_expressions : List[str], optional\n
+    custom_expressions : List[Union[str, Callable[[str], str]]], optional\n
         In this parameter any string method or regex can be passed. They must be passed as a string
-        with column as object. E.g if you want, as in the example with in the custom_transformation parameter, wants
+        with column as object, or as a function that takes and returns a string. String expressions are parsed
+        and validated when CleanColumnNames is created. Only str methods, the functions of the re module
+        (e.g. re.sub), str(), len() and lambdas are allowed, and a ValueError is raised otherwise. E.g if you want, as in the example with in the custom_transformation parameter, wants
         to exclamation point to be replaced with dollarsign, pass the following:
          ["column.replace('!', '$')"]
         or you want capitalize the columns:
@@ -82,10 +93,16 @@ def clean_column_names(
          r're.sub(r"\s+", " ", column).strip()' # noqa: W605
         ]
         By default None
+    cache : bool, optional\n
+        If True, the cleaned names of a list, pandas index or the columns of a pandas dataframe are memoized in a
+        process-wide LRU cache keyed on the raw names and the cleaning options. Cleaning an already seen set of names
+        is then a dictionary lookup. Use clean_column_names_cache_info to get the hit/miss statistics of the cache.
+        By default False
     Returns
     -------
     List[str] or a pandas DataFrame\n
-        A list of cleaned columnames or a dataframe with cleaned columnames
+        A list of cleaned columnames or a dataframe with cleaned columnames. MultiIndex columns are cleaned level by
+        level and returned as a MultiIndex.
 
     Raises
     ------
@@ -101,6 +118,7 @@ def clean_column_names(
         convert_duplicates,
         custom_transformation,
         custom_expressions,
+        cache,
     ).clean_column_names()
 
 
@@ -109,9 +127,11 @@ class CleanColumnNames:
     """Clean messy column names. Inspired by the functions make_clean_names and clean_names from
     the R package janitor.
 
-    snake_case: Code is based on code from [StackOverflow](https://stackoverflow.com/questions/1175208/elegant-python-function-to-convert-camelcase-to-snake-case)
+    The case conversion splits each string into words in one scan, on underscores and where a lower case letter
+    or a digit is followed by an upper case letter, and then joins the words in the target case.
 
-    camelCase: Code is based on code from [StackOverflow](https://stackoverflow.com/questions/19053707/converting-snake-case-to-lower-camel-case-lowercamelcase)
+    The cleaning pipeline is compiled once per process and set of options and shared by all instances. To clean
+    many objects with the same options, e.g. concurrently in a web service, ColumnNameCleaner can be used directly.
 
     Parameters
     ----------
@@ -135,10 +155,14 @@ class CleanColumnNames:
         /{'!':'$'/}. Use with caution if the custom_expressions parameter is used since the custom_expressions parameter
         is evaluated after the custom_transformation parameter.
         Cannot be used together with basic_cleaning, i.e. to use custom transformations basic_cleaning must be set to False.\n
+        Keys may be longer than one character. All replacements are made simultaneously in one pass, i.e. the result of one
+        replacement is never replaced again, and where keys overlap the longest key wins.\n
         By default None
-    custom_expressions : List[str], optional\n
+    custom_expressions : List[Union[str, Callable[[str], str]]], optional\n
         In this parameter any string method or regex can be passed. They must be passed as a string
-        with column as object. E.g if you want, as in the example with in the custom_transformation parameter, wants
+        with column as object, or as a function that takes and returns a string. String expressions are parsed
+        and validated when CleanColumnNames is created. Only str methods, the functions of the re module
+        (e.g. re.sub), str(), len() and lambdas are allowed, and a ValueError is raised otherwise. E.g if you want, as in the example with in the custom_transformation parameter, wants
         to exclamation point to be replaced with dollarsign, pass the following:
          ["column.replace('!', '$')"]
         or you want capitalize the columns:
@@ -151,10 +175,16 @@ class CleanColumnNames:
          r're.sub(r"\s+", " ", column).strip()' # noqa: W605
         ]
         By default None
+    cache : bool, optional\n
+        If True, the cleaned names of a list, pandas index or the columns of a pandas dataframe are memoized in a
+        process-wide LRU cache keyed on the raw names and the cleaning options. Cleaning an already seen set of names
+        is then a dictionary lookup. Use clean_column_names_cache_info to get the hit/miss statistics of the cache.
+        By default False
     Returns
     -------
     List[str] or a pandas DataFrame\n
-        A list of cleaned columnames or a dataframe with cleaned columnames
+        A list of cleaned columnames or a dataframe with cleaned columnames. MultiIndex columns are cleaned level by
+        level and returned as a MultiIndex.
 
     Raises
     ------
@@ -200,14 +230,17 @@ class CleanColumnNames:
     basic_cleaning: bool = True
     convert_duplicates: bool = True
     custom_transformation: Optional[Dict[str, str]] = None
-    custom_expressions: Optional[List[str]] = None
-
-    SNAKE = [
-        r're.sub(r"(.)([A-Z][a-z]+)", r"\1\2", column)',
-        r're.sub(r"([a-z0-9])([A-Z])", r"\1_\2", column).lower().replace("__", "_")',
-    ]
-    CAMEL = SNAKE + [r're.sub(r"_([a-zA-Z0-9])", lambda x: x.group(1).upper(), column)']
-    PASCAL = CAMEL + [r"column[0].upper() + column[1:]"]
+    custom_expressions: Optional[List[Union[str, Callable[[str], str]]]] = None
+    cache: bool = False
+
+    def __post_init__(self):
+        self._cleaner = _get_cleaner(
+            self.case,
+            self.basic_cleaning,
+            self.convert_duplicates,
+            self.custom_transformation,
+            self.custom_expressions,
+        )
 
     def clean_column_names(self) -> Union[List[str], pd.DataFrame]:
         """Clean messy column names. Inspired by the functions make_clean_names and clean_names from
@@ -223,150 +256,241 @@ class CleanColumnNames:
         TypeError\n
             Raises TypeError if the passed object_ is not a list, pandas index or a pandas dataframe
         """
-        if self.basic_cleaning and self.custom_transformation:
-            raise KeyError(
-                "Both basic_cleaning and custom_transformation is set. This is not aloud. Choose one!"
-            )
         if not isinstance(self.object_, (str, list, pd.Index, pd.DataFrame, pd.Series)):
             raise TypeError(
                 f"The passed object_ is a {type(self.object_)}. It must be a string, a list, pandas index, pandas series or a pandas dataframe!"
             )
-        if isinstance(self.object_, str):
-            return self._clean_column_names_str()
-        elif isinstance(self.object_, pd.DataFrame):
-            return self._clean_column_names_dataframe()
-        elif isinstance(self.object_, pd.Series):
-            return self._clean_column_names_series()
-        else:
-            return self._clean_column_names_list()
+        if (
+            self.cache
+            and isinstance(self.object_, (list, pd.Index, pd.DataFrame))
+            and not isinstance(self.object_, pd.MultiIndex)
+            and not isinstance(getattr(self.object_, "columns", None), pd.MultiIndex)
+        ):
+            columns = list(
+                _clean_column_names_cached(
+                    tuple((type(column), column) for column in self.object_),
+                    self._cleaner,
+                )
+            )
+            if isinstance(self.object_, pd.DataFrame):
+                df = self.object_.copy(deep=False)
+                df.columns = columns
+                return df
+            return columns
+        return self._cleaner.clean(self.object_)
+
+    def rename_mapping(self) -> "ColumnNameMapping":
+        """Creates a precomputed {raw: clean} mapping of the column names. The mapping can be saved as json and
+        applied to later dataframes without running the cleaning pipeline again.
 
-    def _clean_column_names_list(
-        self, messy_string: Optional[str] = None
-    ) -> Union[List[str], str]:
-        """Cleans messy columnames. Written to be a utility function.
+        Raw names that occur more than once cannot be mapped unambiguously and are left out of the mapping.
 
         Returns
         -------
-        List[str]\n
-            Cleaned columnnames
+        ColumnNameMapping\n
+            A mapping from the raw names (as strings) to the cleaned names
+
+        Raises
+        ------
+        TypeError\n
+            Raises TypeError if the passed object_ is not a list, pandas index or a pandas dataframe
         """
-        if not messy_string:
-            if self.basic_cleaning:
-                self.object_ = self._basic_cleaning(columns=self.object_)
-            self.object_ = self._clean_column_names(self.object_)
-            return self.object_
+        if isinstance(self.object_, pd.DataFrame):
+            raw = self.object_.columns.to_list()
+        elif isinstance(self.object_, (list, pd.Index)):
+            raw = list(self.object_)
         else:
-            messy_list = [messy_string]
-            if self.basic_cleaning:
-                messy_list = self._basic_cleaning(columns=messy_list)
-            messy_list = self._clean_column_names(messy_list)
-            return messy_list[0]
+            raise TypeError(
+                f"The passed object_ is a {type(self.object_)}. It must be a list, pandas index or a pandas dataframe!"
+            )
+        cleaned = self._cleaner.clean(raw)
+        raw = [str(column) for column in raw]
+        counts = Counter(raw)
+        return ColumnNameMapping(
+            mapping={i: j for i, j in zip(raw, cleaned) if counts[i] == 1},
+            case=self.case,
+            basic_cleaning=self.basic_cleaning,
+            convert_duplicates=self.convert_duplicates,
+            custom_transformation=self.custom_transformation,
+            custom_expressions=self.custom_expressions,
+        )
 
-    def _clean_column_names_str(self) -> str:
-        self.object_ = [self.object_]
-        return self._clean_column_names_list()[0]
 
-    def _clean_column_names_series(self) -> pd.Series:
-        """Cleans members of a messy string series. Written to be a utility function.
+@dataclass(frozen=True)
+class ColumnNameCleaner:
+    """An immutable and reusable column name cleaner. The cleaning pipeline is validated and compiled once, when
+    the cleaner is created, and the clean method does not alter the cleaner. Hence, one cleaner can be shared
+    between threads and used for any number of objects. The cleaner keeps read only copies of custom_transformation
+    and custom_expressions, i.e. later changes to the passed dict or list do not affect it.
 
-        Returns
-        -------
-        pd.Series\n
-            Cleaned series
-        """
-        if not isinstance(self.object_, pd.Series):
-            raise TypeError(
-                f"The passed df is a {type(self.object_)}. It must be a pandas series!"
+    The parameters are the same as for clean_column_names.
+
+    Raises
+    ------
+    KeyError\n
+        Raises KeyError if both basic_cleaning and custom_transformations is used, or if case is not valid.
+    ValueError\n
+        Raises ValueError if a custom expression is not valid or not allowed.
+
+    Example
+    -------
+    ```python
+    from neat_panda import ColumnNameCleaner
+
+    cleaner = ColumnNameCleaner(case="camel")
+
+    cleaner.clean(["country_name", "sub_region"]) # ["countryName", "subRegion"]
+    df = cleaner.clean(df)
+    ```
+    """
+
+    case: Optional[str] = "snake"
+    basic_cleaning: bool = True
+    convert_duplicates: bool = True
+    custom_transformation: Optional[Dict[str, str]] = None
+    custom_expressions: Optional[List[Union[str, Callable[[str], str]]]] = None
+
+    def __post_init__(self):
+        if self.basic_cleaning and self.custom_transformation:
+            raise KeyError(
+                "Both basic_cleaning and custom_transformation is set. This is not aloud. Choose one!"
+            )
+        if self.custom_transformation is not None:
+            object.__setattr__(
+                self,
+                "custom_transformation",
+                MappingProxyType(dict(self.custom_transformation)),
+            )
+        if self.custom_expressions is not None:
+            object.__setattr__(self, "custom_expressions", tuple(self.custom_expressions))
+        functions: List[Callable[[str], str]] = [str]
+        if self.basic_cleaning:
+            functions.extend(
+                _compile_expressions(tuple(self._basic_cleaning_expression()))
+            )
+        if self.custom_transformation:
+            functions.append(
+                _compile_custom_transformation(tuple(self.custom_transformation.items()))
+            )
+        if self.custom_expressions:
+            functions.extend(_compile_expressions(tuple(self.custom_expressions)))
+        if self.case:
+            functions.append(self._case_converter())
+        object.__setattr__(self, "_functions", tuple(functions))
+
+    def __hash__(self):
+        return hash(
+            (
+                self.case,
+                self.basic_cleaning,
+                self.convert_duplicates,
+                frozenset(self.custom_transformation.items())
+                if self.custom_transformation
+                else None,
+                self.custom_expressions or None,
             )
-        _type = self.object_.dtype.__str__()
-        _series = self.object_.copy()
-        _series = _series.apply(self._clean_column_names_list)
-        if _type == "string":
-            _series = _series.astype("string")
-        return _series
-
-    def _basic_cleaning(self, columns) -> List[str]:
-        return self._expressions_eval(
-            columns=columns, expressions=self._basic_cleaning_expression()
         )
 
-    def _clean_column_names_dataframe(self) -> pd.DataFrame:
-        """Cleans messy columnames of a dataframe. Written to be a utility function. It is recommended
-        to use the clean_colum_names method/function instead.
+    def clean(
+        self, object_: Union[str, List[Union[str, int]], pd.Index, pd.Series, pd.DataFrame]
+    ) -> Union[str, List[str], pd.Series, pd.DataFrame]:
+        """Cleans a string, the strings in a list, pandas index or pandas series or the column names of a pandas
+        dataframe.
 
-        Does not alter the original DataFrame.
+        Does not alter the original object. A dataframe is returned as a shallow copy with new column labels.
 
         Returns
         -------
-        pd.DataFrame\n
-            A dataframe with cleaned columnames
+        str, List[str], pd.Series or pd.DataFrame\n
+            The cleaned string(s) or a dataframe with cleaned columnames
 
         Raises
         ------
         TypeError\n
-            If the df object is not a pandas dataframe TypeError is raised
+            Raises TypeError if the passed object_ is not a string, list, pandas index, pandas series or a pandas dataframe
         """
-        if not isinstance(self.object_, pd.DataFrame):
-            raise TypeError(
-                f"The passed df is a {type(self.object_)}. It must be a pandas dataframe!"
-            )
-        df = self.object_.copy()
-        df.columns = self._clean_column_names_list()
-        return df
+        if isinstance(object_, str):
+            return self.clean_string(object_)
+        elif isinstance(object_, pd.DataFrame):
+            df = object_.copy(deep=False)
+            if isinstance(object_.columns, pd.MultiIndex):
+                df.columns = self._clean_multi_index(object_.columns)
+            else:
+                df.columns = self._clean_list(object_.columns)
+            return df
+        elif isinstance(object_, pd.Series):
+            _type = object_.dtype.__str__()
+            _series = object_.apply(self.clean_string)
+            if _type == "string":
+                _series = _series.astype("string")
+            return _series
+        elif isinstance(object_, pd.MultiIndex):
+            return self._clean_multi_index(object_)
+        elif isinstance(object_, (list, pd.Index)):
+            return self._clean_list(object_)
+        raise TypeError(
+            f"The passed object_ is a {type(object_)}. It must be a string, a list, pandas index, pandas series or a pandas dataframe!"
+        )
 
-    def _clean_column_names(self, columns) -> List[str]:
-        """Base function for clean_columnames. Can be used for very specific needs.
-        ----------
-        columns : Union[List[Union[str, int]], pd.Index]\n
-            Messy columnnames
+    def clean_string(self, column: Union[str, int]) -> str:
+        """Cleans a single string. Duplicates are not converted since a single string has none.
+        """
+        for function in self._functions:  # type: ignore
+            column = function(column)
+        return column  # type: ignore
 
-        Returns
-        -------
-        List[str]\n
-            Clean columnnames
+    def _clean_list(self, columns: Union[List[Union[str, int]], pd.Index]) -> List[str]:
+        cleaned = [self.clean_string(column) for column in columns]
+        if self.convert_duplicates:
+            cleaned = self._convert_duplicates(columns=cleaned)
+        return cleaned
 
-        Raises
-        ------
-        TypeError\n
-            If passed column object is not a list or a pandas index TypeError is raised
+    def _clean_multi_index(self, columns: pd.MultiIndex) -> pd.MultiIndex:
+        """Cleans each level of a MultiIndex separately. Only the unique values of each level are cleaned and, if the
+        cleaned values of each level are still unique, the index is rebuilt from its existing codes. Otherwise it is
+        rebuilt from the cleaned values of each column.
+
+        If convert_duplicates is True, only the cleaned columns (tuples) that collide are numbered, in column order,
+        and the number is added to the first level of the column that has a value.
         """
-        if not isinstance(columns, (list, pd.Index, pd.DataFrame)):
-            raise TypeError(
-                f"The passed columns is a {type(columns)}. It must be a list, pandas index or a pandas dataframe!"
-            )
-        if type(columns) == pd.Index:
-            columns = columns.to_list()  # type: ignore
-        columns = [str(column) for column in columns]
-        if self.custom_transformation:
-            for i, j in self.custom_transformation.items():
-                columns = [k.replace(i, j) for k in columns]
-        if self.custom_expressions:
-            columns = self._expressions_eval(
-                columns=columns, expressions=self.custom_expressions
-            )
-        if self.case:
-            _expressions = self._expressions_case_setter()
-            columns = self._expressions_eval(columns=columns, expressions=_expressions)
+        levels = [[self.clean_string(value) for value in level] for level in columns.levels]
         if self.convert_duplicates:
-            columns = self._convert_duplicates(columns=columns)
-        return columns
-
-    def _expressions_case_setter(self):
-        if self.case.lower() not in ["camel", "pascal", "snake", "c", "p", "s"]:
-            raise KeyError()
-        if self.case[0].lower() == "s":
-            return self.SNAKE
-        elif self.case[0].lower() == "c":
-            return self.CAMEL
+            cleaned_codes = pd.DataFrame(
+                {
+                    i: np.where(
+                        codes == -1, -1, pd.factorize(np.asarray(level, dtype=object))[0][codes]
+                    )
+                    for i, (level, codes) in enumerate(zip(levels, columns.codes))
+                }
+            )
+            colliding = cleaned_codes.duplicated(keep=False).to_numpy()
         else:
-            return self.PASCAL
-
-    def _expressions_eval(self, columns, expressions):
-        for reg in expressions:
-            columns = [
-                eval(reg, {}, {"column": column, "re": re}) for column in columns
-            ]
-        return columns
+            colliding = np.zeros(len(columns), dtype=bool)
+        if not colliding.any():
+            try:
+                return columns.set_levels(levels)
+            except ValueError:
+                pass
+        arrays = [
+            np.where(codes == -1, np.nan, np.asarray(level, dtype=object)[codes])
+            for level, codes in zip(levels, columns.codes)
+        ]
+        if colliding.any():
+            positions = np.flatnonzero(colliding)
+            numbers = cleaned_codes.iloc[positions].groupby(
+                list(cleaned_codes.columns), sort=False
+            ).cumcount() + 1
+            for position, number in zip(positions, numbers):
+                for array in arrays:
+                    if isinstance(array[position], str):
+                        array[position] = f"{array[position]}{number}"
+                        break
+        return pd.MultiIndex.from_arrays(arrays, names=columns.names)
+
+    def _case_converter(self) -> Callable[[str], str]:
+        if self.case.lower() not in ["camel", "pascal", "snake", "c", "p", "s"]:  # type: ignore
+            raise KeyError()
+        return _CASE_CONVERTERS[self.case[0].lower()]  # type: ignore
 
     @staticmethod
     def _convert_duplicates(columns: List[str]) -> List[str]:
@@ -419,3 +543,389 @@ class CleanColumnNames:
             r'column.replace("__","_")',  # remove double underscore and replace with single underscore
         ]
 
+
+@dataclass
+class ColumnNameMapping:
+    """A precomputed {raw: clean} mapping of column names, created with CleanColumnNames.rename_mapping.
+
+    The mapping is applied to a dataframe as a plain rename, i.e. no regex work is done. If any of the column
+    names of the dataframe is missing from the mapping (or occurs more than once) the complete set of names is
+    instead cleaned by the live pipeline with the same options as those used when the mapping was created.
+
+    Note that convert_duplicates is resolved when the mapping is created. Hence, applying the mapping to a
+    dataframe with only a subset of the original columns may give other names than the live pipeline would.
+
+    Example
+    -------
+    ```python
+    from neat_panda import CleanColumnNames, ColumnNameMapping
+
+    mapping = CleanColumnNames(df).rename_mapping()
+    mapping.to_json("columns.json")
+
+    # at startup of a service
+    mapping = ColumnNameMapping.from_json("columns.json")
+    df = mapping.apply(df)
+    ```
+    """
+
+    mapping: Dict[str, str]
+    case: str = "snake"
+    basic_cleaning: bool = True
+    convert_duplicates: bool = True
+    custom_transformation: Optional[Dict[str, str]] = None
+    custom_expressions: Optional[List[Union[str, Callable[[str], str]]]] = None
+
+    def apply(
+        self, object_: Union[List[Union[str, int]], pd.Index, pd.DataFrame]
+    ) -> Union[List[str], pd.DataFrame]:
+        """Renames the columns of a dataframe, or the strings in a list or pandas index, using the mapping.
+
+        Does not alter the original DataFrame.
+
+        Parameters
+        ----------
+        object_: Union[List[Union[str, int]], pd.Index, pd.DataFrame]\n
+            Messy strings in a list, pandas index or a pandas dataframe with messy columnames
+
+        Returns
+        -------
+        List[str] or a pandas DataFrame\n
+            A list of cleaned columnames or a dataframe with cleaned columnames
+
+        Raises
+        ------
+        TypeError\n
+            Raises TypeError if the passed object_ is not a list, pandas index or a pandas dataframe
+        """
+        if isinstance(object_, pd.DataFrame):
+            raw = object_.columns.to_list()
+        elif isinstance(object_, (list, pd.Index)):
+            raw = list(object_)
+        else:
+            raise TypeError(
+                f"The passed object_ is a {type(object_)}. It must be a list, pandas index or a pandas dataframe!"
+            )
+        keys = [str(column) for column in raw]
+        if len(set(keys)) == len(keys) and all(key in self.mapping for key in keys):
+            cleaned = [self.mapping[key] for key in keys]
+        else:
+            cleaned = _get_cleaner(
+                self.case,
+                self.basic_cleaning,
+                self.convert_duplicates,
+                self.custom_transformation,
+                self.custom_expressions,
+            ).clean(raw)
+        if isinstance(object_, pd.DataFrame):
+            df = object_.copy(deep=False)
+            df.columns = cleaned
+            return df
+        return cleaned
+
+    def to_json(self, path: Optional[str] = None) -> Optional[str]:
+        """Serializes the mapping, together with the cleaning options, to json. Custom expressions passed as
+        callables cannot be serialized.
+
+        Parameters
+        ----------
+        path : Optional[str], optional\n
+            File path to write the json to. If None the json is returned as a string. By default None
+
+        Returns
+        -------
+        Optional[str]\n
+            The json string if path is None, otherwise None
+        """
+        data = json.dumps(self.__dict__, ensure_ascii=False, indent=2)
+        if path is None:
+            return data
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(data)
+        return None
+
+    @classmethod
+    def from_json(cls, path: str) -> "ColumnNameMapping":
+        """Loads a mapping saved with to_json.
+
+        Parameters
+        ----------
+        path : str\n
+            File path to the json file
+
+        Returns
+        -------
+        ColumnNameMapping
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(**json.loads(f.read()))
+
+
+_WORD_BOUNDARY = re.compile(r"_+|(?<=[a-z0-9])(?=[A-Z])")
+_ALPHANUMERIC = frozenset(string.ascii_letters + string.digits)
+
+
+def _to_snake_case(column: str) -> str:
+    """Converts a string to snake_case, e.g. 'countryName' -> 'country_name'.
+    """
+    return "_".join(_WORD_BOUNDARY.split(column)).lower()
+
+
+def _to_camel_case(column: str) -> str:
+    """Converts a string to camelCase, e.g. 'country_name' -> 'countryName'. Words that do not
+    start with a letter or a digit keep their leading underscore.
+    """
+    first, *words = _WORD_BOUNDARY.split(column)
+    return first.lower() + "".join(
+        word[0].upper() + word[1:].lower()
+        if word and word[0] in _ALPHANUMERIC
+        else "_" + word.lower()
+        for word in words
+    )
+
+
+def _to_pascal_case(column: str) -> str:
+    """Converts a string to PascalCase, e.g. 'country_name' -> 'CountryName'.
+    """
+    column = _to_camel_case(column)
+    return column[:1].upper() + column[1:]
+
+
+_CASE_CONVERTERS: Dict[str, Callable[[str], str]] = {
+    "s": _to_snake_case,
+    "c": _to_camel_case,
+    "p": _to_pascal_case,
+}
+
+
+_EXPRESSION_NODES = tuple(
+    getattr(ast, name)
+    for name in [
+        "Expression",
+        "Call",
+        "Attribute",
+        "Name",
+        "Load",
+        "Constant",
+        "Str",
+        "Num",
+        "NameConstant",
+        "keyword",
+        "Subscript",
+        "Index",
+        "Slice",
+        "BinOp",
+        "Add",
+        "Mult",
+        "Mod",
+        "UnaryOp",
+        "USub",
+        "Not",
+        "IfExp",
+        "Compare",
+        "Eq",
+        "NotEq",
+        "Lt",
+        "LtE",
+        "Gt",
+        "GtE",
+        "In",
+        "NotIn",
+        "BoolOp",
+        "And",
+        "Or",
+        "Tuple",
+        "List",
+        "Lambda",
+        "arguments",
+        "arg",
+        "JoinedStr",
+        "FormattedValue",
+    ]
+    if hasattr(ast, name)
+)
+_EXPRESSION_BUILTINS = {"str": str, "len": len}
+_RE_ATTRIBUTES = frozenset(
+    ["sub", "subn", "split", "match", "fullmatch", "search", "findall", "escape"]
+    + ["A", "ASCII", "I", "IGNORECASE", "M", "MULTILINE", "S", "DOTALL", "X", "VERBOSE"]
+)
+_METHOD_ATTRIBUTES = frozenset(
+    [
+        method
+        for method in dir(str)
+        if not method.startswith("_") and method not in ("format", "format_map")
+    ]
+    + ["group", "groups", "groupdict", "start", "end", "span", "expand"]
+)
+
+
+def _compile_expressions(
+    expressions: Tuple[Union[str, Callable[[str], str]], ...]
+) -> Tuple[Callable[[str], str], ...]:
+    """Compiles custom expressions into functions. Callables are returned as they are.
+
+    Raises
+    ------
+    TypeError\n
+        Raises TypeError if an expression is neither a string nor a callable
+    ValueError\n
+        Raises ValueError if a string expression is not valid or not allowed
+    """
+    functions = []
+    for expression in expressions:
+        if callable(expression):
+            functions.append(expression)
+        elif isinstance(expression, str):
+            functions.append(_compile_expression(expression))
+        else:
+            raise TypeError(
+                f"The passed expression is a {type(expression)}. It must be a string or a callable!"
+            )
+    return tuple(functions)
+
+
+@lru_cache(maxsize=256)
+def _compile_expression(expression: str) -> Callable[[str], str]:
+    """Parses a string expression, with column as object, validates it against an allowlist of str methods,
+    re functions and a few builtins and compiles it into a function of column.
+    """
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"The expression {expression!r} is not valid: {e.msg}")
+    names = {"column", "re"} | set(_EXPRESSION_BUILTINS)
+    names |= {node.arg for node in ast.walk(tree) if isinstance(node, ast.arg)}
+    for node in ast.walk(tree):
+        if not isinstance(node, _EXPRESSION_NODES):
+            raise ValueError(
+                f"The expression {expression!r} is not allowed: {type(node).__name__} is not supported"
+            )
+        if isinstance(node, ast.Name) and node.id not in names:
+            raise ValueError(
+                f"The expression {expression!r} is not allowed: the name {node.id!r} is not supported"
+            )
+        if isinstance(node, ast.Attribute):
+            if isinstance(node.value, ast.Name) and node.value.id == "re":
+                allowed = node.attr in _RE_ATTRIBUTES
+            else:
+                allowed = node.attr in _METHOD_ATTRIBUTES
+            if not allowed:
+                raise ValueError(
+                    f"The expression {expression!r} is not allowed: the attribute {node.attr!r} is not supported"
+                )
+    code = compile(f"lambda column: ({expression.strip()}\n)", "<custom_expression>", "eval")
+    return eval(code, {"__builtins__": _EXPRESSION_BUILTINS, "re": re})
+
+
+_CACHE_MAXSIZE = 1024
+
+
+@lru_cache(maxsize=_CACHE_MAXSIZE)
+def _clean_column_names_cached(
+    columns: Tuple[Tuple[type, Union[str, int]], ...], cleaner: ColumnNameCleaner
+) -> Tuple[str, ...]:
+    """Memoized cleaning used when CleanColumnNames is called with cache=True. The names are passed together
+    with their types, since e.g. 1, 1.0 and True are equal keys but are cleaned differently.
+    """
+    return tuple(cleaner.clean([column for _, column in columns]))
+
+
+@lru_cache(maxsize=128)
+def _get_cached_cleaner(
+    case: Optional[str],
+    basic_cleaning: bool,
+    convert_duplicates: bool,
+    custom_transformation: Optional[Tuple[Tuple[str, str], ...]],
+    custom_expressions: Optional[Tuple[Union[str, Callable[[str], str]], ...]],
+) -> ColumnNameCleaner:
+    return ColumnNameCleaner(
+        case,
+        basic_cleaning,
+        convert_duplicates,
+        dict(custom_transformation) if custom_transformation else None,
+        list(custom_expressions) if custom_expressions else None,
+    )
+
+
+def _get_cleaner(
+    case: Optional[str],
+    basic_cleaning: bool,
+    convert_duplicates: bool,
+    custom_transformation: Optional[Dict[str, str]],
+    custom_expressions: Optional[List[Union[str, Callable[[str], str]]]],
+) -> ColumnNameCleaner:
+    """Returns a cleaner for the given options. Cleaners are created once per process and set of options,
+    unless the options are not hashable.
+    """
+    try:
+        return _get_cached_cleaner(
+            case,
+            basic_cleaning,
+            convert_duplicates,
+            tuple(custom_transformation.items()) if custom_transformation else None,
+            tuple(custom_expressions) if custom_expressions else None,
+        )
+    except TypeError:
+        return ColumnNameCleaner(
+            case,
+            basic_cleaning,
+            convert_duplicates,
+            custom_transformation,
+            custom_expressions,
+        )
+
+
+def clean_column_names_cache_info():
+    """Returns the statistics of the process-wide cache used by clean_column_names when cache=True.
+
+    Returns
+    -------
+    functools._CacheInfo\n
+        A named tuple with the fields hits, misses, maxsize and currsize
+    """
+    return _clean_column_names_cached.cache_info()
+
+
+def clean_column_names_cache_clear() -> None:
+    """Empties the process-wide cache used by clean_column_names when cache=True and resets its statistics.
+    """
+    _clean_column_names_cached.cache_clear()
+
+
+@lru_cache(maxsize=128)
+def _compile_custom_transformation(
+    transformation: Tuple[Tuple[str, str], ...]
+) -> Callable[[str], str]:
+    """Compiles the items of a custom_transformation dict into a function that performs all
+    replacements in one pass over a string.
+
+    If all keys are single characters a str.maketrans table is used, otherwise the keys are
+    combined into one alternation regex where longer keys take precedence over shorter ones.
+    All replacements are made simultaneously, i.e. the output of one replacement is never
+    matched by another.
+
+    Parameters
+    ----------
+    transformation : Tuple[Tuple[str, str], ...]\n
+        The items of a custom_transformation dict
+
+    Returns
+    -------
+    Callable[[str], str]\n
+        A function that applies the transformation to a string
+
+    Raises
+    ------
+    ValueError\n
+        Raises ValueError if any of the keys is an empty string
+    """
+    mapping = dict(transformation)
+    if "" in mapping:
+        raise ValueError("The keys of custom_transformation must be non-empty strings!")
+    if all(len(key) == 1 for key in mapping):
+        table = str.maketrans(mapping)
+        return lambda column: column.translate(table)
+    pattern = re.compile(
+        "|".join(re.escape(key) for key in sorted(mapping, key=len, reverse=True))
+    )
+    return lambda column: pattern.sub(lambda match: mapping[match.group(0)], column)
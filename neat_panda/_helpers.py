@@ -1,3 +1,6 @@
+from typing import Any, Callable, Dict, Optional, List, Tuple
+
+import numpy as np
 import pandas as pd
 from warnings import warn
 import toml
@@ -76,48 +79,431 @@ def _get_version_from_toml(path: str) -> str:
         return data["tool"]["poetry"]["version"]
 
 
-def control_value(func):
-    def _control_value(*args, **kwargs):
-        if isinstance(args[0], pd.DataFrame):
-            dataframe1, dataframe2 = args[:2]
-        else:
-            dataframe1, dataframe2 = args[0].dataframe1, args[0].dataframe2
-        if len(dataframe1.columns.to_list()) != len(dataframe2.columns.to_list()):
-            raise ValueError(
-                "The number of columns in the two dataframes must be identical."
-            )
-        if dataframe1.columns.to_list() != dataframe2.columns.to_list():
-            warn(
-                "The columnnames are not identical. The columnnames of the second dataframe is renamed to match those of dataframe1"
+def _check_columns(dataframe1: pd.DataFrame, dataframe2: pd.DataFrame) -> pd.DataFrame:
+    """Checks that the dataframes have the same number of columns and returns dataframe2, with the column names of
+    dataframe1 if the names differ. dataframe2 itself is not altered.
+    """
+    if len(dataframe1.columns) != len(dataframe2.columns):
+        raise ValueError(
+            "The number of columns in the two dataframes must be identical."
+        )
+    if dataframe1.columns.to_list() != dataframe2.columns.to_list():
+        warn(
+            "The columnnames are not identical. The columnnames of the second dataframe is renamed to match those of dataframe1"
+        )
+        dataframe2 = dataframe2.copy(deep=False)
+        dataframe2.columns = dataframe1.columns
+    return dataframe2
+
+
+def _warn_duplicates(n_duplicates: int, name: str) -> None:
+    if n_duplicates > 0:
+        warn(
+            UserWarning(
+                f"There are {n_duplicates} duplicate rows in {name}. These are dropped in order to perform set operations"
             )
-            dataframe2.columns = dataframe1.columns.to_list()
-        return func(*args, **kwargs)
-
-    return _control_value
-
-
-def control_duplicates(func):
-    def _control_duplicates(*args, **kwargs):
-        if isinstance(args[0], pd.DataFrame):
-            dataframe1, dataframe2 = args[:2]
-        else:
-            dataframe1, dataframe2 = args[0].dataframe1, args[0].dataframe2
-        _duplicates_dataframe1 = dataframe1.duplicated().sum()
-        _duplicates_dataframe2 = dataframe2.duplicated().sum()
-        if _duplicates_dataframe1 > 0:
-            warn(
-                UserWarning(
-                    f"There are {_duplicates_dataframe1} duplicate rows in dataframe1. These are dropped in order to perform set operations"
-                )
+        )
+
+
+def _row_fingerprints(
+    df: pd.DataFrame, columns: Optional[List[str]] = None
+) -> np.ndarray:
+    """Returns a 64-bit fingerprint (hash) of each row of the dataframe, or of the given columns. Equal rows
+    always have equal fingerprints, but different rows may (very rarely) share a fingerprint.
+    """
+    if columns is not None:
+        df = df[columns]
+    return pd.util.hash_pandas_object(_canonical_floats(df), index=False).to_numpy()
+
+
+def _canonical_floats(df: pd.DataFrame) -> pd.DataFrame:
+    """Returns the dataframe with a single bit pattern for equal floats, since fingerprints hash the raw bits. Every
+    NaN becomes np.nan (e.g. 0/0 sets the sign bit) and -0.0 becomes 0.0. Other columns are not copied.
+    """
+    return _replace_numeric_columns(df, "f", _canonical_float_values)
+
+
+def _canonical_float_values(values: np.ndarray) -> np.ndarray:
+    values = values + values.dtype.type(0.0)
+    values[np.isnan(values)] = np.nan
+    return values
+
+
+def _stable_fingerprints(df: pd.DataFrame) -> np.ndarray:
+    """Returns a 64-bit fingerprint of each row that does not depend on the dtype a column happened to get, e.g.
+    int64 in one chunk and float64 (because of a missing value) in another. Used where fingerprints of different
+    dataframes are compared without aligning their dtypes first.
+
+    Numeric columns are hashed value by value, losslessly: integers and integral floats (1.0) as int64, other floats
+    by their canonical bits. Hence, integers above 2**53, which are not exact as floats, keep distinct fingerprints.
+    uint64 values above the int64 range are hashed as floats if they are exact floats, and otherwise by their bits.
+    """
+    return pd.util.hash_pandas_object(
+        _replace_numeric_columns(df, "biuf", _stable_hashes), index=False
+    ).to_numpy()
+
+
+def _stable_hashes(values: np.ndarray) -> np.ndarray:
+    """Returns a hash of each number that is equal for equal numbers of any numeric dtype.
+    """
+    if values.dtype.kind in "bi":
+        return pd.util.hash_array(values.astype(np.int64))
+    if values.dtype.kind == "u":
+        values = values.astype(np.uint64)
+        exact = values <= np.uint64(2 ** 63 - 1)
+        if exact.all():
+            return pd.util.hash_array(values.astype(np.int64))
+        hashes = _mix_fingerprints(values, 2)
+        hashes[exact] = pd.util.hash_array(values[exact].astype(np.int64))
+        as_float = values.astype(np.float64)
+        floats = ~exact & (as_float < 2.0 ** 64)
+        floats[floats] = as_float[floats].astype(np.uint64) == values[floats]
+        hashes[floats] = _stable_hashes(as_float[floats])
+        return hashes
+    values = _canonical_float_values(values.astype(np.float64))
+    with np.errstate(invalid="ignore"):
+        integral = (np.trunc(values) == values) & (np.abs(values) < 2.0 ** 63)
+    hashes = _mix_fingerprints(values.view(np.uint64), 1)
+    hashes[integral] = pd.util.hash_array(values[integral].astype(np.int64))
+    return hashes
+
+
+def _replace_numeric_columns(
+    df: pd.DataFrame, kinds: str, function: Callable[[np.ndarray], np.ndarray]
+) -> pd.DataFrame:
+    """Returns the dataframe with function applied to the values of the numpy columns whose dtype kind is one of
+    kinds. The dataframe is not altered and the other columns are not copied.
+    """
+    return _replace_columns(
+        df,
+        {
+            i: function(df.iloc[:, i].to_numpy())
+            for i, dtype in enumerate(df.dtypes)
+            if isinstance(dtype, np.dtype) and dtype.kind in kinds
+        },
+    )
+
+
+def _replace_columns(df: pd.DataFrame, columns: Dict[int, Any]) -> pd.DataFrame:
+    """Returns the dataframe with the columns at the given positions replaced, which works for duplicate column
+    labels too. The dataframe is not altered and the other columns are not copied.
+    """
+    if not columns:
+        return df
+    replaced = pd.DataFrame(
+        {
+            i: pd.Series(columns[i], index=df.index) if i in columns else df.iloc[:, i]
+            for i in range(df.shape[1])
+        },
+        index=df.index,
+    )
+    replaced.columns = df.columns
+    return replaced
+
+
+def _mix_fingerprints(fingerprints: np.ndarray, seed: int = 0) -> np.ndarray:
+    """Remixes fingerprints with a seed (a splitmix64 step), so that different seeds give independent hash
+    functions and all bits are evenly distributed.
+    """
+    x = fingerprints + np.uint64(0x9E3779B97F4A7C15 * (seed + 1) % 2 ** 64)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _unify_categories(*dataframes: pd.DataFrame) -> Tuple[pd.DataFrame, ...]:
+    """Gives the columns that are unordered categoricals in all dataframes, but with different categories, the
+    union of the categories. Only the integer codes are recoded, i.e. the columns stay categorical and the values
+    are never converted to objects, and the codes of equal values are equal across the dataframes. The dataframes
+    must have the same columns. Columns with identical dtypes are not copied.
+    """
+    if not dataframes[0].columns.is_unique:
+        return dataframes
+    unified = {}
+    for column in dataframes[0].columns:
+        dtypes = [df[column].dtype for df in dataframes]
+        if not all(isinstance(dtype, pd.CategoricalDtype) for dtype in dtypes):
+            continue
+        if any(dtype.ordered for dtype in dtypes) or all(
+            dtype.categories.equals(dtypes[0].categories) for dtype in dtypes
+        ):
+            continue
+        categories = dtypes[0].categories
+        for dtype in dtypes[1:]:
+            categories = categories.append(
+                dtype.categories[~dtype.categories.isin(categories)]
             )
-            dataframe1 = dataframe1.drop_duplicates()
-        if _duplicates_dataframe2 > 0:
-            warn(
-                UserWarning(
-                    f"There are {_duplicates_dataframe2} duplicate rows in dataframe2. These are dropped in order to perform set operations"
-                )
+        unified[column] = pd.CategoricalDtype(categories)
+    if not unified:
+        return dataframes
+    return tuple(
+        df.astype(
+            {
+                c: dtype
+                for c, dtype in unified.items()
+                if not df[c].cat.categories.equals(dtype.categories)
+            }
+        )
+        for df in dataframes
+    )
+
+
+def _concat(dataframes: List[pd.DataFrame], **kwargs) -> pd.DataFrame:
+    """pandas concat, but categorical columns with different categories stay categorical instead of being
+    converted to objects.
+    """
+    return pd.concat(_unify_categories(*dataframes), **kwargs)
+
+
+def _align_dtypes(*dataframes: pd.DataFrame) -> Tuple[pd.DataFrame, ...]:
+    """Casts the columns whose dtypes differ between the dataframes to their common dtype, e.g. int64 and float64
+    to float64, so that equal values get equal fingerprints. Categorical columns get the union of their categories,
+    see _unify_categories. The dataframes must have the same columns, compared by position since labels may repeat.
+    Columns with identical dtypes are not copied.
+    """
+    dataframes = _unify_categories(*dataframes)
+    common = pd.concat([df.iloc[:0] for df in dataframes]).dtypes
+    aligned = []
+    for df in dataframes:
+        aligned.append(
+            _replace_columns(
+                df,
+                {
+                    i: df.iloc[:, i].astype(common.iloc[i]).array
+                    for i in range(df.shape[1])
+                    if df.dtypes.iloc[i] != common.iloc[i]
+                },
             )
-            dataframe2 = dataframe2.drop_duplicates()
-        return func(*args, **kwargs)
+        )
+    return tuple(aligned)
+
+
+def _rows_equal(left: pd.DataFrame, right: pd.DataFrame) -> np.ndarray:
+    """Compares two dataframes with the same columns and length row by row. Missing values are considered
+    equal to each other. Categorical columns with the same categories are compared on their codes.
+    """
+    equal = np.ones(len(left), dtype=bool)
+    for i in range(left.shape[1]):
+        left_values = left.iloc[:, i].reset_index(drop=True)
+        right_values = right.iloc[:, i].reset_index(drop=True)
+        if (
+            isinstance(left_values.dtype, pd.CategoricalDtype)
+            and isinstance(right_values.dtype, pd.CategoricalDtype)
+            and left_values.cat.categories.equals(right_values.cat.categories)
+        ):
+            equal &= left_values.cat.codes.to_numpy() == right_values.cat.codes.to_numpy()
+            continue
+        try:
+            same = left_values == right_values
+        except TypeError:
+            same = left_values.astype(object) == right_values.astype(object)
+        equal &= same.fillna(False).to_numpy(dtype=bool) | (
+            left_values.isna() & right_values.isna()
+        ).to_numpy(dtype=bool)
+    return equal
+
+
+def _lookup(left_fingerprints: np.ndarray, right_fingerprints: np.ndarray) -> np.ndarray:
+    """Returns, for each left fingerprint, the position of the first right row with the same fingerprint,
+    or -1 if there is none.
+    """
+    if len(right_fingerprints) == 0:
+        return np.full(len(left_fingerprints), -1, dtype=np.intp)
+    index = pd.Index(right_fingerprints)
+    positions = np.arange(len(right_fingerprints))
+    if not index.is_unique:
+        first = ~index.duplicated()
+        index, positions = index[first], positions[first]
+    found = index.get_indexer(left_fingerprints)
+    return np.where(found >= 0, positions[found], -1)
+
+
+def _isin_rows(
+    left: pd.DataFrame,
+    right: pd.DataFrame,
+    left_fingerprints: np.ndarray,
+    right_fingerprints: np.ndarray,
+) -> np.ndarray:
+    """Returns a boolean mask over the rows of left that are also rows of right. Rows are matched on their
+    fingerprints and every match is verified to be exact, i.e. fingerprint collisions are handled.
+    """
+    return _verify_matches(
+        left,
+        right,
+        left_fingerprints,
+        right_fingerprints,
+        _lookup(left_fingerprints, right_fingerprints),
+    )
+
+
+def _isin_rows_both(
+    left: pd.DataFrame,
+    right: pd.DataFrame,
+    left_fingerprints: np.ndarray,
+    right_fingerprints: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns boolean masks over the rows of left that are rows of right and over the rows of right that are
+    rows of left. Both masks are computed from one hash table of the fingerprints of both dataframes.
+    """
+    codes, uniques = pd.factorize(
+        np.concatenate([left_fingerprints, right_fingerprints])
+    )
+    left_codes, right_codes = codes[: len(left)], codes[len(left) :]
+    first_left = _first_positions(left_codes, len(uniques))
+    first_right = _first_positions(right_codes, len(uniques))
+    left_in_right = _verify_matches(
+        left, right, left_fingerprints, right_fingerprints, first_right[left_codes]
+    )
+    right_in_left = _verify_matches(
+        right, left, right_fingerprints, left_fingerprints, first_left[right_codes]
+    )
+    return left_in_right, right_in_left
+
+
+def _first_positions(codes: np.ndarray, n_codes: int) -> np.ndarray:
+    """Returns the position of the first occurrence of each code, or -1 for codes that do not occur.
+    """
+    first = np.full(n_codes, -1, dtype=np.intp)
+    first[codes[::-1]] = np.arange(len(codes), dtype=np.intp)[::-1]
+    return first
+
+
+def _verify_matches(
+    left: pd.DataFrame,
+    right: pd.DataFrame,
+    left_fingerprints: np.ndarray,
+    right_fingerprints: np.ndarray,
+    match: np.ndarray,
+) -> np.ndarray:
+    """Verifies that each left row is equal to the right row at the matched position (-1 for no match) and
+    returns a boolean mask over the rows of left that are rows of right. Rows that do not equal their match,
+    i.e. fingerprint collisions, are checked exactly against all rows of right with the same fingerprint.
+    """
+    candidates = np.flatnonzero(match >= 0)
+    equal = _rows_equal(left.iloc[candidates], right.iloc[match[candidates]])
+    isin = np.zeros(len(left), dtype=bool)
+    isin[candidates[equal]] = True
+    collisions = candidates[~equal]
+    if len(collisions):
+        shared = np.isin(right_fingerprints, left_fingerprints[collisions])
+        isin[collisions] = _isin_rows_exact(left.iloc[collisions], right[shared])
+    return isin
+
+
+def _isin_rows_exact(left: pd.DataFrame, right: pd.DataFrame) -> np.ndarray:
+    """Slow path of _isin_rows, used for the rows whose fingerprint collides with a different row.
+    """
+    indicator = "__neat_panda_indicator__"
+    merged = left.reset_index(drop=True).merge(
+        right.drop_duplicates(), how="left", indicator=indicator
+    )
+    return (merged[indicator] == "both").to_numpy()
 
-    return _control_duplicates
+
+def _first_occurrences(df: pd.DataFrame, fingerprints: np.ndarray) -> np.ndarray:
+    """Returns a boolean mask over the rows of the dataframe that are the first occurrence of their value,
+    i.e. the negation of DataFrame.duplicated, computed from the fingerprints.
+    """
+    duplicated = pd.Index(fingerprints).duplicated()
+    if duplicated.any():
+        positions = np.flatnonzero(duplicated)
+        first = _lookup(fingerprints[positions], fingerprints)
+        collisions = positions[~_rows_equal(df.iloc[positions], df.iloc[first])]
+        if len(collisions):
+            shared = np.flatnonzero(np.isin(fingerprints, fingerprints[collisions]))
+            duplicated[shared] = df.iloc[shared].duplicated().to_numpy()
+    return ~duplicated
+
+
+def _unique_rows(df: pd.DataFrame) -> np.ndarray:
+    """Returns a boolean mask over the first occurrence of each row of the dataframe.
+    """
+    return _first_occurrences(df, _row_fingerprints(df))
+
+
+def _row_codes(
+    dataframes: List[pd.DataFrame], fingerprints: List[np.ndarray]
+) -> List[np.ndarray]:
+    """Returns an integer code per row of each dataframe, such that two rows, in the same or in different
+    dataframes, are equal if and only if their codes are equal. The codes come from one factorization of all
+    fingerprints. Every row is verified, one column at a time, against the first row with the same fingerprint, and
+    rows whose fingerprint collides with a different row are given exact codes of their own.
+    """
+    offsets = np.cumsum([0] + [len(df) for df in dataframes])
+    codes, uniques = pd.factorize(np.concatenate(fingerprints))
+    first = _first_positions(codes, len(uniques))[codes]
+    repeated = np.flatnonzero(first != np.arange(len(codes)))
+    equal = np.ones(len(repeated), dtype=bool)
+    for k in range(dataframes[0].shape[1]):
+        column = pd.concat([df.iloc[:, k] for df in dataframes], ignore_index=True)
+        equal &= _rows_equal(
+            column.iloc[repeated].to_frame(), column.iloc[first[repeated]].to_frame()
+        )
+    collisions = repeated[~equal]
+    if len(collisions):
+        shared = np.flatnonzero(np.isin(codes, codes[collisions]))
+        frame = np.searchsorted(offsets, shared, side="right") - 1
+        rows = pd.concat(
+            [
+                dataframes[i].iloc[shared[frame == i] - offsets[i]]
+                for i in np.unique(frame)
+            ],
+            ignore_index=True,
+        )
+        exact = rows.groupby(
+            [rows.iloc[:, k] for k in range(rows.shape[1])], dropna=False, sort=False
+        ).ngroup()
+        codes[shared] = len(uniques) + exact.to_numpy()
+    return [codes[offsets[i] : offsets[i + 1]] for i in range(len(dataframes))]
+
+
+def _key_array(keys: pd.DataFrame) -> np.ndarray:
+    """Returns the key columns as one numpy array, a structured array if there are several key columns, whose
+    elements compare lexicographically.
+    """
+    columns = [keys.iloc[:, k].to_numpy() for k in range(keys.shape[1])]
+    if len(columns) == 1:
+        return columns[0]
+    return np.rec.fromarrays(columns, names=[f"f{k}" for k in range(len(columns))])
+
+
+def _check_sorted(keys: pd.DataFrame, name: str) -> None:
+    """Raises ValueError unless the key columns are free of missing values and sorted ascending, lexicographically
+    if there are several key columns. Each column is compared once with itself shifted by one row.
+    """
+    if keys.isna().to_numpy().any():
+        raise ValueError(
+            f"The key columns of {name} contain missing values, which is not supported with assume_sorted"
+        )
+    decided = np.zeros(max(len(keys) - 1, 0), dtype=bool)
+    for k in range(keys.shape[1]):
+        values = keys.iloc[:, k].to_numpy()
+        previous, current = values[:-1], values[1:]
+        if (~decided & (current < previous)).any():
+            raise ValueError(f"{name} is not sorted by the key columns")
+        decided |= current > previous
+
+
+def _isin_sorted(left: pd.DataFrame, right: pd.DataFrame) -> np.ndarray:
+    """Returns a boolean mask over the rows of left that are also rows of right, for key frames that are sorted
+    ascending. Each left row is located in right with a binary search (a merge walk), and the candidates are
+    verified to be equal. No hash table is built.
+    """
+    right_keys = _key_array(right)
+    positions = np.searchsorted(right_keys, _key_array(left))
+    candidates = np.flatnonzero(positions < len(right))
+    isin = np.zeros(len(left), dtype=bool)
+    isin[candidates] = _rows_equal(
+        left.iloc[candidates], right.iloc[positions[candidates]]
+    )
+    return isin
+
+
+def _sorted_first_occurrences(df: pd.DataFrame) -> np.ndarray:
+    """Returns a boolean mask over the rows of a sorted dataframe that are the first occurrence of their value.
+    Equal rows of a sorted dataframe are adjacent, hence each row is only compared with the previous row.
+    """
+    first = np.ones(len(df), dtype=bool)
+    if len(df) > 1:
+        first[1:] = ~_rows_equal(df.iloc[1:], df.iloc[:-1])
+    return first
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+
+from typing import List, Optional, Tuple
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from ._helpers import _stable_fingerprints, _first_occurrences
+
+
+@dataclass(eq=False)
+class IncrementalDifference:
+    """A materialized set difference, left minus right, that is maintained as batches are appended to either side.
+    Each update returns only the change of the result and costs time proportional to the size of the batch, i.e.
+    the history is never compared again.
+
+    Only the fingerprints of the rows (and keys) that have been seen are kept, not the rows themselves. Hence, two
+    different rows that share a fingerprint, which happens with a probability of about n / 2**64 per row after n
+    rows, are taken to be equal. The rows are fingerprinted independently of the dtypes of the batches, e.g. a
+    column may be int64 in one batch and float64 in another.
+
+    Parameters
+    ----------
+    on : Optional[List[str]], default None\n
+        Key columns that identify a row. A left row is in the result if its key is not found among the right rows.
+        By default None, i.e. entire rows are compared.
+
+    Example
+    -------
+    ```python
+    import neat_panda
+
+    unseen = neat_panda.IncrementalDifference()
+    unseen.add_right(history)
+    new_rows = unseen.add_left(feed)  # the rows of feed that are not in history
+    unseen.add_right(feed)
+    ```
+    """
+
+    on: Optional[List[str]] = None
+    columns: Optional[List[str]] = field(default=None, init=False)
+
+    def __post_init__(self):
+        self.on = list(self.on) if self.on else None
+        self._left_rows = _FingerprintSet()
+        self._left_keys = self._left_rows if self.on is None else _FingerprintSet()
+        self._right_keys = _FingerprintSet()
+
+    def add_left(self, batch: pd.DataFrame) -> pd.DataFrame:
+        """Appends a batch to the left side and returns the rows that are added to the result, i.e. the rows of the
+        batch that have not been seen on the left before and whose row (or key) is not on the right. Duplicate rows
+        of the batch are dropped.
+
+        Does not alter the original DataFrame.
+
+        Parameters
+        ----------
+        batch : pd.DataFrame\n
+
+        Returns
+        -------
+        pd.DataFrame\n
+            The rows added to the result
+
+        Raises
+        ------
+        ValueError\n
+            Raises ValueError if on is not given and the columns of the batch are not those of the previous
+            batches.
+        KeyError\n
+            Raises KeyError if any of the key columns is not a column of the batch.
+        """
+        rows, keys = _fingerprints(self, batch)
+        unique = _first_occurrences(batch, rows)
+        added = unique & ~self._left_rows.contains(rows) & ~self._right_keys.contains(keys)
+        self._left_rows.add(rows)
+        if self.on is not None:
+            self._left_keys.add(keys)
+        return batch[added]
+
+    def add_right(self, batch: pd.DataFrame) -> pd.DataFrame:
+        """Appends a batch to the right side and returns the rows of the batch that remove rows from the result,
+        i.e. whose row (or key) has been seen on the left but not on the right before. If on is given, all left
+        rows with the key of a returned row are removed from the result. Rows with the same row (or key) are only
+        returned once.
+
+        Does not alter the original DataFrame.
+
+        Parameters
+        ----------
+        batch : pd.DataFrame\n
+            See add_left
+
+        Returns
+        -------
+        pd.DataFrame\n
+            The rows of the batch that remove rows from the result
+        """
+        _, keys = _fingerprints(self, batch)
+        unique = _first_occurrences(batch if self.on is None else batch[self.on], keys)
+        removed = unique & self._left_keys.contains(keys) & ~self._right_keys.contains(keys)
+        self._right_keys.add(keys)
+        return batch[removed]
+
+
+@dataclass(eq=False)
+class IncrementalUnion:
+    """A materialized, distinct set union that is maintained as batches are appended. Each update returns only the
+    rows that are new to the union and costs time proportional to the size of the batch.
+
+    Only fingerprints are kept, see IncrementalDifference.
+
+    Parameters
+    ----------
+    on : Optional[List[str]], default None\n
+        Key columns that identify a row. A row is new if its key has not been seen in a previous batch. By default
+        None, i.e. entire rows are compared.
+    """
+
+    on: Optional[List[str]] = None
+    columns: Optional[List[str]] = field(default=None, init=False)
+
+    def __post_init__(self):
+        self.on = list(self.on) if self.on else None
+        self._keys = _FingerprintSet()
+
+    def add(self, batch: pd.DataFrame) -> pd.DataFrame:
+        """Appends a batch and returns its rows that are new to the union. Duplicate rows of the batch are dropped.
+
+        Does not alter the original DataFrame.
+
+        Parameters
+        ----------
+        batch : pd.DataFrame\n
+            See IncrementalDifference.add_left
+
+        Returns
+        -------
+        pd.DataFrame\n
+            The rows added to the union
+        """
+        rows, keys = _fingerprints(self, batch)
+        added = _first_occurrences(batch, rows) & ~self._keys.contains(keys)
+        self._keys.add(keys)
+        return batch[added]
+
+
+def _fingerprints(state, batch: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """Checks the batch against the columns of the previous batches and returns the fingerprints of its rows and
+    of its keys, which are the same array if on is not given.
+    """
+    if state.columns is None:
+        state.columns = batch.columns.to_list()
+    if state.on is None:
+        if batch.columns.to_list() != state.columns:
+            raise ValueError(
+                "The columns of the batch must be identical to the columns of the previous batches."
+            )
+        rows = _stable_fingerprints(batch)
+        return rows, rows
+    missing = [column for column in state.on if column not in batch.columns]
+    if missing:
+        raise KeyError(
+            f"The following key columns are not found in the batch: {', '.join(map(str, missing))}"
+        )
+    return _stable_fingerprints(batch), _stable_fingerprints(batch[state.on])
+
+
+class _FingerprintSet:
+    """A growing set of fingerprints, stored as sorted arrays (levels) whose sizes more than double from the newest
+    to the oldest. A new batch becomes a level of its own and levels of similar size are merged, so adding n
+    fingerprints costs O(n log n) amortized and a lookup is a binary search per level.
+    """
+
+    def __init__(self):
+        self.levels: List[np.ndarray] = []
+
+    def __len__(self) -> int:
+        return sum(len(level) for level in self.levels)
+
+    def contains(self, fingerprints: np.ndarray) -> np.ndarray:
+        found = np.zeros(len(fingerprints), dtype=bool)
+        for level in self.levels:
+            positions = np.searchsorted(level, fingerprints)
+            inside = positions < len(level)
+            found[inside] |= level[positions[inside]] == fingerprints[inside]
+        return found
+
+    def add(self, fingerprints: np.ndarray) -> None:
+        new = np.unique(fingerprints)
+        new = new[~self.contains(new)]
+        if not len(new):
+            return
+        self.levels.append(new)
+        while len(self.levels) > 1 and len(self.levels[-2]) <= 2 * len(self.levels[-1]):
+            last = self.levels.pop()
+            self.levels[-1] = np.sort(np.concatenate([self.levels[-1], last]))
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ._helpers import _lookup, _verify_matches
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+
+def _resolve_n_jobs(n_jobs: int) -> int:
+    """Returns the number of processes to use. -1 means one process per cpu.
+    """
+    if not isinstance(n_jobs, int) or isinstance(n_jobs, bool):
+        raise TypeError("n_jobs must be an integer")
+    if n_jobs == -1:
+        return os.cpu_count() or 1
+    if n_jobs < 1:
+        raise ValueError("n_jobs must be a positive integer or -1")
+    return n_jobs
+
+
+def _isin_rows_parallel(
+    left: pd.DataFrame,
+    right: pd.DataFrame,
+    left_fingerprints: np.ndarray,
+    right_fingerprints: np.ndarray,
+    n_jobs: int,
+) -> np.ndarray:
+    """Same as _isin_rows, but the fingerprints are hash partitioned and looked up in n_jobs worker processes.
+    The matches are verified in the calling process.
+    """
+    (match,) = _parallel_lookups(left_fingerprints, right_fingerprints, n_jobs, False)
+    return _verify_matches(left, right, left_fingerprints, right_fingerprints, match)
+
+
+def _isin_rows_both_parallel(
+    left: pd.DataFrame,
+    right: pd.DataFrame,
+    left_fingerprints: np.ndarray,
+    right_fingerprints: np.ndarray,
+    n_jobs: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Same as _isin_rows_both, but the fingerprints are hash partitioned and looked up in n_jobs worker processes.
+    """
+    left_match, right_match = _parallel_lookups(
+        left_fingerprints, right_fingerprints, n_jobs, True
+    )
+    return (
+        _verify_matches(left, right, left_fingerprints, right_fingerprints, left_match),
+        _verify_matches(right, left, right_fingerprints, left_fingerprints, right_match),
+    )
+
+
+def _parallel_lookups(
+    left_fingerprints: np.ndarray,
+    right_fingerprints: np.ndarray,
+    n_jobs: int,
+    both: bool,
+) -> List[np.ndarray]:
+    """Computes _lookup(left, right), and _lookup(right, left) if both is True, with one worker process per hash
+    partition. The rows are ordered by partition once, in the calling process, and each worker only reads its own
+    contiguous range of that order. The fingerprints, the orders and the results are stored in shared memory, i.e.
+    the arrays are never pickled. Runs in the calling process if n_jobs is 1 or if shared memory is not available
+    (Python 3.7).
+    """
+    if n_jobs == 1 or shared_memory is None:
+        matches = [_lookup(left_fingerprints, right_fingerprints)]
+        if both:
+            matches.append(_lookup(right_fingerprints, left_fingerprints))
+        return matches
+    left_order, left_bounds = _partition_order(left_fingerprints, n_jobs)
+    right_order, right_bounds = _partition_order(right_fingerprints, n_jobs)
+    arrays = [
+        (np.uint64, len(left_fingerprints)),
+        (np.uint64, len(right_fingerprints)),
+        (np.intp, len(left_fingerprints)),
+        (np.intp, len(right_fingerprints)),
+        (np.intp, len(left_fingerprints)),
+        (np.intp, len(right_fingerprints) if both else 0),
+    ]
+    blocks = [
+        shared_memory.SharedMemory(
+            create=True, size=max(np.dtype(dtype).itemsize * length, 1)
+        )
+        for dtype, length in arrays
+    ]
+    try:
+        specs = [
+            (block.name, dtype, length) for block, (dtype, length) in zip(blocks, arrays)
+        ]
+        for block, (dtype, length), values in zip(
+            blocks,
+            arrays,
+            [left_fingerprints, right_fingerprints, left_order, right_order],
+        ):
+            _attach(block, dtype, length)[:] = values
+        tasks = [
+            (
+                specs,
+                (left_bounds[partition], left_bounds[partition + 1]),
+                (right_bounds[partition], right_bounds[partition + 1]),
+                both,
+            )
+            for partition in range(n_jobs)
+        ]
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            list(executor.map(_lookup_partition, tasks))
+        matches = [_attach(blocks[4], np.intp, len(left_fingerprints)).copy()]
+        if both:
+            matches.append(_attach(blocks[5], np.intp, len(right_fingerprints)).copy())
+        return matches
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+def _partition_order(
+    fingerprints: np.ndarray, n_partitions: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the positions of the fingerprints ordered by hash partition (fingerprint % n_partitions) and the
+    bounds of each partition in that order. The partitions are small integers, which numpy sorts with a stable
+    radix sort, i.e. in linear time.
+    """
+    partitions = fingerprints % np.uint64(n_partitions)
+    if n_partitions <= 2 ** 16:
+        partitions = partitions.astype(np.uint16)
+    order = np.argsort(partitions, kind="stable")
+    bounds = np.searchsorted(
+        partitions[order], np.arange(n_partitions + 1), side="left"
+    )
+    return order, bounds
+
+
+def _attach(block, dtype, length: int) -> np.ndarray:
+    return np.ndarray((length,), dtype=dtype, buffer=block.buf)
+
+
+def _lookup_partition(args: tuple) -> None:
+    """Worker of _parallel_lookups. Looks up the fingerprints of one hash partition, i.e. one contiguous range of
+    each partition order, and writes the global positions of the matches to shared memory.
+    """
+    specs, (left_start, left_stop), (right_start, right_stop), both = args
+    blocks = [shared_memory.SharedMemory(name=name) for name, _, _ in specs]
+    try:
+        left, right, left_order, right_order, left_match, right_match = [
+            _attach(block, dtype, length)
+            for block, (_, dtype, length) in zip(blocks, specs)
+        ]
+        left_positions = left_order[left_start:left_stop]
+        right_positions = right_order[right_start:right_stop]
+        found = _lookup(left[left_positions], right[right_positions])
+        left_match[left_positions] = np.where(found >= 0, right_positions[found], -1)
+        if both:
+            found = _lookup(right[right_positions], left[left_positions])
+            right_match[right_positions] = np.where(
+                found >= 0, left_positions[found], -1
+            )
+        del left, right, left_order, right_order, left_match, right_match
+        del left_positions, right_positions
+    finally:
+        for block in blocks:
+            block.close()
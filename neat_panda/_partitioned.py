@@ -0,0 +1,391 @@
+# -*- coding: utf-8 -*-
+
+import os
+import pickle
+import tempfile
+import warnings
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from ._set_operations import SetOperations
+from ._helpers import (
+    _check_columns,
+    _warn_duplicates,
+    _stable_fingerprints,
+    _mix_fingerprints,
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+_PARQUET_SUFFIXES = (".parquet", ".pq")
+_ARROW_SUFFIXES = (".feather", ".arrow", ".ipc")
+_CSV_SUFFIXES = (".csv",)
+_DEFAULT_PARTITIONS = 32
+_MAX_DEPTH = 3
+
+
+@dataclass
+class PartitionedSetOperations:
+    """Set operations between two sources that do not fit in memory together.
+
+    Both sources are read chunk by chunk and hash partitioned on their key columns (or entire rows) into buckets
+    on disk. Equal rows, and rows with equal keys, always end up in buckets with the same number, hence each pair of
+    buckets is processed independently by SetOperations. Buckets that are larger than memory_budget are partitioned
+    again before they are processed, so that peak memory is bounded by the budget rather than by the size of the
+    sources.
+
+    The result is returned as an iterator of dataframes, one per pair of buckets, or written to a target file.
+    The order of the rows is not preserved.
+
+    Parameters
+    ----------
+    source1 : Any\n
+        A pandas DataFrame, an iterable of pandas DataFrames, or the path to a parquet (.parquet, .pq),
+        feather (.feather, .arrow, .ipc) or csv (.csv) file. Parquet and feather files requires pyarrow.
+    source2 : Any\n
+        See source1
+    on : Optional[List[str]], default None\n
+        Key columns that identify a row. See SetOperations.
+    memory_budget : int, default 268435456\n
+        The maximal size in bytes of a pair of buckets, as stored on disk, that is processed at once. The peak memory
+        usage is a small multiple of the budget.
+    n_partitions : Optional[int], default None\n
+        The number of buckets each source is partitioned into. By default 32.
+    chunksize : int, default 100000\n
+        The number of rows read at a time from files and dataframes
+    temporary_directory : Optional[str], default None\n
+        The directory in which the buckets are stored. By default the directory of the tempfile module.
+    """
+
+    source1: Any
+    source2: Any
+    on: Optional[List[str]] = None
+    memory_budget: int = 256 * 2 ** 20
+    n_partitions: Optional[int] = None
+    chunksize: int = 100_000
+    temporary_directory: Optional[str] = None
+
+    def difference(self, target: Any = None) -> Optional[Iterator[pd.DataFrame]]:
+        """The set difference between source1 and source2. See SetOperations.difference.
+
+        Parameters
+        ----------
+        target : Any, default None\n
+            The path to a parquet, feather or csv file to which the result is written. By default None, i.e. the
+            result is returned as an iterator of dataframes.
+
+        Returns
+        -------
+        Optional[Iterator[pd.DataFrame]]\n
+            An iterator of dataframes if target is None, otherwise None
+        """
+        return self._run("difference", target, on=self.on)
+
+    def intersection(
+        self, target: Any = None, flag_conflicts: bool = False
+    ) -> Optional[Iterator[pd.DataFrame]]:
+        """The set intersection between source1 and source2. See SetOperations.intersection.
+
+        Parameters
+        ----------
+        target : Any, default None\n
+            See difference
+        flag_conflicts : bool, default False\n
+            See SetOperations.intersection
+
+        Returns
+        -------
+        Optional[Iterator[pd.DataFrame]]\n
+            An iterator of dataframes if target is None, otherwise None
+        """
+        return self._run(
+            "intersection", target, on=self.on, flag_conflicts=flag_conflicts
+        )
+
+    def symmetric_difference(
+        self, target: Any = None, dataframe_names: Optional[List[str]] = None
+    ) -> Optional[Iterator[pd.DataFrame]]:
+        """The symmetric set difference between source1 and source2. See SetOperations.symmetric_difference.
+
+        Parameters
+        ----------
+        target : Any, default None\n
+            See difference
+        dataframe_names : Optional[List[str]], default None\n
+            See SetOperations.symmetric_difference
+
+        Returns
+        -------
+        Optional[Iterator[pd.DataFrame]]\n
+            An iterator of dataframes if target is None, otherwise None
+
+        Raises
+        ------
+        ValueError\n
+            Raises ValueError if the dataframe_names parameter is used and the length of the passed list is not 2.
+        """
+        if dataframe_names and len(dataframe_names) != 2:
+            raise ValueError("Only two dataframe names")
+        return self._run(
+            "symmetric_difference",
+            target,
+            on=self.on,
+            dataframe_names=dataframe_names,
+        )
+
+    def union(
+        self, target: Any = None, distinct: bool = False
+    ) -> Optional[Iterator[pd.DataFrame]]:
+        """The set union between source1 and source2. See SetOperations.union.
+
+        Parameters
+        ----------
+        target : Any, default None\n
+            See difference
+        distinct : bool, default False\n
+            See SetOperations.union
+
+        Returns
+        -------
+        Optional[Iterator[pd.DataFrame]]\n
+            An iterator of dataframes if target is None, otherwise None
+        """
+        return self._run("union", target, on=self.on, distinct=distinct)
+
+    def _run(self, operation: str, target: Any, **kwargs) -> Optional[Iterator[pd.DataFrame]]:
+        results = self._results(operation, kwargs)
+        if target is None:
+            return (df for df in results if len(df))
+        _write_chunks(results, target)
+        return None
+
+    def _results(self, operation: str, kwargs: dict) -> Iterator[pd.DataFrame]:
+        n_partitions = self.n_partitions or _DEFAULT_PARTITIONS
+        with tempfile.TemporaryDirectory(dir=self.temporary_directory) as directory:
+            chunks1 = _iter_chunks(self.source1, self.chunksize)
+            chunks2 = _iter_chunks(self.source2, self.chunksize)
+            first1, first2 = next(chunks1, None), next(chunks2, None)
+            if first1 is None and first2 is None:
+                return
+            schema1 = (first1 if first1 is not None else first2).iloc[:0]
+            schema2 = (first2 if first2 is not None else first1).iloc[:0]
+            schema2 = _check_columns(schema1, schema2)
+            if self.on:
+                missing = [c for c in self.on if c not in schema1.columns]
+                if missing:
+                    raise KeyError(
+                        f"The following key columns are not found in the sources: {', '.join(map(str, missing))}"
+                    )
+            paths1 = _partition(
+                _prepend(first1, chunks1), self.on, n_partitions, 0, Path(directory, "1")
+            )
+            paths2 = _partition(
+                _prepend(first2, chunks2, schema1.columns),
+                self.on,
+                n_partitions,
+                0,
+                Path(directory, "2"),
+            )
+            duplicates = [0, 0]
+            for df1, df2 in self._bucket_pairs(paths1, paths2, n_partitions, 1):
+                df1 = df1 if df1 is not None else schema1
+                df2 = df2 if df2 is not None else schema2
+                duplicates[0] += int(df1.duplicated().sum())
+                duplicates[1] += int(df2.duplicated().sum())
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore", UserWarning)
+                    result = getattr(SetOperations(df1, df2), operation)(**kwargs)
+                yield result
+            _warn_duplicates(duplicates[0], "source1")
+            _warn_duplicates(duplicates[1], "source2")
+
+    def _bucket_pairs(
+        self, paths1: List[Path], paths2: List[Path], n_partitions: int, depth: int
+    ) -> Iterator[Tuple[Optional[pd.DataFrame], Optional[pd.DataFrame]]]:
+        for path1, path2 in zip(paths1, paths2):
+            size = _size(path1) + _size(path2)
+            if size == 0:
+                continue
+            if size > self.memory_budget and depth <= _MAX_DEPTH:
+                subpaths1 = _partition(
+                    _read_bucket(path1), self.on, n_partitions, depth, path1.with_suffix(".d")
+                )
+                subpaths2 = _partition(
+                    _read_bucket(path2), self.on, n_partitions, depth, path2.with_suffix(".d")
+                )
+                _remove(path1)
+                _remove(path2)
+                yield from self._bucket_pairs(subpaths1, subpaths2, n_partitions, depth + 1)
+            else:
+                df1, df2 = _load_bucket(path1), _load_bucket(path2)
+                _remove(path1)
+                _remove(path2)
+                yield df1, df2
+
+
+def _iter_chunks(source: Any, chunksize: int) -> Iterator[pd.DataFrame]:
+    """Yields the source as dataframes of at most chunksize rows (iterables of dataframes are passed as they are).
+    """
+    if isinstance(source, pd.DataFrame):
+        for start in range(0, max(len(source), 1), chunksize):
+            yield source.iloc[start : start + chunksize]
+        return
+    if isinstance(source, (str, os.PathLike)):
+        suffix = Path(source).suffix.lower()
+        if suffix in _CSV_SUFFIXES:
+            yield from pd.read_csv(source, chunksize=chunksize)
+            return
+        if suffix not in _PARQUET_SUFFIXES + _ARROW_SUFFIXES:
+            raise ValueError(
+                f"Unknown file type '{suffix}'. Only parquet, feather and csv files are supported."
+            )
+        if pa is None:
+            raise ImportError(
+                "It is necessary to install 'pyarrow' to read parquet and feather files."
+            )
+        if suffix in _PARQUET_SUFFIXES:
+            for batch in pq.ParquetFile(source).iter_batches(batch_size=chunksize):
+                yield batch.to_pandas()
+        else:
+            with pa.memory_map(str(source)) as f:
+                reader = pa.ipc.open_file(f)
+                for i in range(reader.num_record_batches):
+                    yield from _iter_chunks(reader.get_batch(i).to_pandas(), chunksize)
+        return
+    for chunk in source:
+        if not isinstance(chunk, pd.DataFrame):
+            raise TypeError(
+                "The sources must be pandas DataFrames, iterables of pandas DataFrames or paths to files"
+            )
+        yield chunk
+
+
+def _prepend(
+    first: Optional[pd.DataFrame],
+    chunks: Iterator[pd.DataFrame],
+    columns: Optional[pd.Index] = None,
+) -> Iterator[pd.DataFrame]:
+    if first is None:
+        return
+    for chunk in _chain(first, chunks):
+        if columns is not None and not chunk.columns.equals(columns):
+            chunk = chunk.set_axis(columns, axis=1)
+        yield chunk
+
+
+def _chain(first: pd.DataFrame, chunks: Iterator[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+    yield first
+    yield from chunks
+
+
+def _partition_codes(
+    chunk: pd.DataFrame, on: Optional[List[str]], n_partitions: int, depth: int
+) -> np.ndarray:
+    """Returns the bucket of each row of the chunk. The fingerprints do not depend on the dtypes the chunk
+    happened to get, and they are remixed with a seed per depth, i.e. a bucket that is partitioned again is split
+    evenly.
+    """
+    keys = chunk[on] if on else chunk
+    fingerprints = _mix_fingerprints(_stable_fingerprints(keys), depth)
+    return (fingerprints % np.uint64(n_partitions)).astype(np.intp)
+
+
+def _partition(
+    chunks: Iterable[pd.DataFrame],
+    on: Optional[List[str]],
+    n_partitions: int,
+    depth: int,
+    directory: Path,
+) -> List[Path]:
+    """Hash partitions the chunks into n_partitions bucket files in directory. Each bucket file is a stream of
+    pickled dataframes.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = [directory / f"{i}.pkl" for i in range(n_partitions)]
+    files = {}
+    try:
+        for chunk in chunks:
+            codes = _partition_codes(chunk, on, n_partitions, depth)
+            for code, piece in chunk.groupby(codes, sort=False):
+                if code not in files:
+                    files[code] = open(paths[code], "wb")
+                pickle.dump(piece, files[code], protocol=pickle.HIGHEST_PROTOCOL)
+    finally:
+        for f in files.values():
+            f.close()
+    return paths
+
+
+def _read_bucket(path: Path) -> Iterator[pd.DataFrame]:
+    if not path.exists():
+        return
+    with open(path, "rb") as f:
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
+
+
+def _load_bucket(path: Path) -> Optional[pd.DataFrame]:
+    pieces = list(_read_bucket(path))
+    if not pieces:
+        return None
+    return pd.concat(pieces) if len(pieces) > 1 else pieces[0]
+
+
+def _size(path: Path) -> int:
+    return path.stat().st_size if path.exists() else 0
+
+
+def _remove(path: Path) -> None:
+    if path.exists():
+        path.unlink()
+
+
+def _write_chunks(chunks: Iterator[pd.DataFrame], target: Any) -> None:
+    """Writes the chunks to a parquet, feather or csv file. The first chunk is always written, even if it is
+    empty, so that the file gets the columns of the result.
+    """
+    suffix = Path(target).suffix.lower()
+    if suffix in _CSV_SUFFIXES:
+        header = True
+        for chunk in chunks:
+            if header or len(chunk):
+                chunk.to_csv(target, mode="w" if header else "a", header=header, index=False)
+                header = False
+        return
+    if suffix not in _PARQUET_SUFFIXES + _ARROW_SUFFIXES:
+        raise ValueError(
+            f"Unknown file type '{suffix}'. Only parquet, feather and csv files are supported."
+        )
+    if pa is None:
+        raise ImportError(
+            "It is necessary to install 'pyarrow' to write parquet and feather files."
+        )
+    writer, schema = None, None
+    try:
+        for chunk in chunks:
+            if writer is not None and not len(chunk):
+                continue
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                schema = table.schema
+                if suffix in _PARQUET_SUFFIXES:
+                    writer = pq.ParquetWriter(str(target), schema)
+                else:
+                    writer = pa.ipc.new_file(str(target), schema)
+            writer.write_table(table.cast(schema))
+    finally:
+        if writer is not None:
+            writer.close()
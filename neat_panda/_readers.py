@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+
+from typing import Union, List, Dict, Optional, Any
+
+import pandas as pd
+
+from ._caretaker import CleanColumnNames
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+
+_HEADER_EXCLUDED_KWARGS = (
+    "nrows",
+    "chunksize",
+    "iterator",
+    "index_col",
+    "usecols",
+    "dtype",
+    "converters",
+    "parse_dates",
+    "skipfooter",
+)
+
+
+def read_csv_clean(
+    filepath_or_buffer: Any,
+    columns: Optional[List[str]] = None,
+    case: str = "snake",
+    basic_cleaning: bool = True,
+    convert_duplicates: bool = True,
+    custom_transformation: Optional[Dict[str, str]] = None,
+    custom_expressions: Optional[List[str]] = None,
+    **kwargs,
+) -> pd.DataFrame:
+    """Reads a csv file with clean column names. Only the header is read before the column names are cleaned,
+    the data is then parsed once under the cleaned names. Hence, the dataframe is never copied in order to
+    rename its columns.
+
+    Parameters
+    ----------
+    filepath_or_buffer : Any\n
+        Any valid input to pandas.read_csv. If a buffer is passed it must be seekable since the header is read twice.
+    columns : Optional[List[str]], optional\n
+        The cleaned names of the columns to read. The selection is passed to pandas.read_csv as usecols, i.e.
+        the other columns are never parsed. The columns are returned in the order of the file. By default None,
+        which means that all columns are read.
+    case, basic_cleaning, convert_duplicates, custom_transformation, custom_expressions\n
+        See clean_column_names
+    **kwargs\n
+        Passed to pandas.read_csv. Parameters that refers to columns by name, e.g. dtype, parse_dates or index_col,
+        must use the cleaned names. The parameters header, names and usecols are set by the function.
+
+    Returns
+    -------
+    pd.DataFrame\n
+        A dataframe with cleaned columnames
+
+    Raises
+    ------
+    KeyError\n
+        Raises KeyError if any of the names in columns is not a cleaned column name of the file
+    """
+    header_kwargs = {k: v for k, v in kwargs.items() if k not in _HEADER_EXCLUDED_KWARGS}
+    position = _tell(filepath_or_buffer)
+    header = pd.read_csv(filepath_or_buffer, nrows=0, **header_kwargs).columns.to_list()
+    _seek(filepath_or_buffer, position)
+    names = _clean_header(
+        header,
+        case,
+        basic_cleaning,
+        convert_duplicates,
+        custom_transformation,
+        custom_expressions,
+    )
+    return pd.read_csv(
+        filepath_or_buffer,
+        header=0,
+        names=names,
+        usecols=_column_positions(names, columns),
+        **kwargs,
+    )
+
+
+def read_excel_clean(
+    io: Any,
+    columns: Optional[List[str]] = None,
+    case: str = "snake",
+    basic_cleaning: bool = True,
+    convert_duplicates: bool = True,
+    custom_transformation: Optional[Dict[str, str]] = None,
+    custom_expressions: Optional[List[str]] = None,
+    **kwargs,
+) -> pd.DataFrame:
+    """Reads an excel sheet with clean column names. Only the header is read before the column names are cleaned,
+    the data is then parsed once under the cleaned names.
+
+    Parameters
+    ----------
+    io : Any\n
+        Any valid input to pandas.read_excel. Only one sheet can be read, i.e. sheet_name must not be a list or None.
+    columns : Optional[List[str]], optional\n
+        The cleaned names of the columns to read. The selection is passed to pandas.read_excel as usecols, i.e.
+        the other columns are never parsed. The columns are returned in the order of the sheet. By default None,
+        which means that all columns are read.
+    case, basic_cleaning, convert_duplicates, custom_transformation, custom_expressions\n
+        See clean_column_names
+    **kwargs\n
+        Passed to pandas.read_excel. Parameters that refers to columns by name, e.g. dtype, parse_dates or index_col,
+        must use the cleaned names. The parameters header, names and usecols are set by the function.
+
+    Returns
+    -------
+    pd.DataFrame\n
+        A dataframe with cleaned columnames
+
+    Raises
+    ------
+    KeyError\n
+        Raises KeyError if any of the names in columns is not a cleaned column name of the sheet
+    """
+    header_kwargs = {k: v for k, v in kwargs.items() if k not in _HEADER_EXCLUDED_KWARGS}
+    position = _tell(io)
+    header = pd.read_excel(io, nrows=0, **header_kwargs).columns.to_list()
+    _seek(io, position)
+    names = _clean_header(
+        header,
+        case,
+        basic_cleaning,
+        convert_duplicates,
+        custom_transformation,
+        custom_expressions,
+    )
+    return pd.read_excel(
+        io, header=0, names=names, usecols=_column_positions(names, columns), **kwargs
+    )
+
+
+def read_parquet_clean(
+    path: Any,
+    columns: Optional[List[str]] = None,
+    case: str = "snake",
+    basic_cleaning: bool = True,
+    convert_duplicates: bool = True,
+    custom_transformation: Optional[Dict[str, str]] = None,
+    custom_expressions: Optional[List[str]] = None,
+    **kwargs,
+) -> pd.DataFrame:
+    """Reads a parquet file with clean column names. The column names are cleaned from the schema of the file,
+    i.e. before any data is read, and only the selected columns are read. Requires pyarrow.
+
+    Parameters
+    ----------
+    path : Any\n
+        Any valid input to pyarrow.parquet.read_schema and pandas.read_parquet
+    columns : Optional[List[str]], optional\n
+        The cleaned names of the columns to read. The selection is passed to pandas.read_parquet as columns, i.e.
+        the other columns are never read. By default None, which means that all columns are read.
+    case, basic_cleaning, convert_duplicates, custom_transformation, custom_expressions\n
+        See clean_column_names
+    **kwargs\n
+        Passed to pandas.read_parquet.
+
+    Returns
+    -------
+    pd.DataFrame\n
+        A dataframe with cleaned columnames
+
+    Raises
+    ------
+    ImportError\n
+        Raises ImportError if pyarrow is not installed
+    KeyError\n
+        Raises KeyError if any of the names in columns is not a cleaned column name of the file
+    """
+    if pq is None:
+        raise ImportError(
+            "It is necessary to install 'pyarrow' for the function read_parquet_clean to work."
+        )
+    schema = pq.read_schema(path)
+    index_columns = (schema.pandas_metadata or {}).get("index_columns", [])
+    header = [name for name in schema.names if name not in index_columns]
+    names = _clean_header(
+        header,
+        case,
+        basic_cleaning,
+        convert_duplicates,
+        custom_transformation,
+        custom_expressions,
+    )
+    positions = _column_positions(names, columns)
+    if positions is not None:
+        header = [header[i] for i in positions]
+        names = [names[i] for i in positions]
+    df = pd.read_parquet(path, columns=header, **kwargs)
+    df.columns = names
+    return df
+
+
+def _clean_header(
+    header: List[Union[str, int]],
+    case: str,
+    basic_cleaning: bool,
+    convert_duplicates: bool,
+    custom_transformation: Optional[Dict[str, str]],
+    custom_expressions: Optional[List[str]],
+) -> List[str]:
+    return CleanColumnNames(
+        header,
+        case,
+        basic_cleaning,
+        convert_duplicates,
+        custom_transformation,
+        custom_expressions,
+    ).clean_column_names()
+
+
+def _column_positions(
+    names: List[str], columns: Optional[List[str]]
+) -> Optional[List[int]]:
+    if columns is None:
+        return None
+    missing = [column for column in columns if column not in names]
+    if missing:
+        raise KeyError(
+            f"The following columns are not found among the cleaned column names: {', '.join(missing)}"
+        )
+    selected = set(columns)
+    return [i for i, name in enumerate(names) if name in selected]
+
+
+def _tell(filepath_or_buffer: Any) -> Optional[int]:
+    if hasattr(filepath_or_buffer, "seek") and hasattr(filepath_or_buffer, "tell"):
+        return filepath_or_buffer.tell()
+    return None
+
+
+def _seek(filepath_or_buffer: Any, position: Optional[int]) -> None:
+    if position is not None:
+        filepath_or_buffer.seek(position)
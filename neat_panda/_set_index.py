@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from ._helpers import _row_fingerprints, _rows_equal, _unique_rows
+
+
+@dataclass(eq=False)
+class SetIndex:
+    """A compact index of the rows (or keys) of a reference dataframe, used to compute set operations between many
+    batches and the same reference without fingerprinting the reference again.
+
+    The index stores the sorted, unique 64-bit fingerprints of the reference rows together with the columns and
+    dtypes of the reference. A batch is cast to the dtypes of the reference, fingerprinted and looked up with a
+    binary search, i.e. the cost of a lookup is proportional to the size of the batch.
+
+    Since the reference itself is not stored, matches are not verified. Two different rows share a fingerprint with
+    a probability of about len(index) / 2**64 per row of the batch.
+
+    Use SetIndex.from_dataframe to build an index and SetIndex.load to load a saved index.
+
+    Parameters
+    ----------
+    fingerprints : np.ndarray\n
+        The sorted, unique fingerprints of the reference
+    columns : List[str]\n
+        The columns of the reference
+    dtypes : Dict[str, str]\n
+        The dtypes of the indexed columns of the reference
+    on : Optional[List[str]], default None\n
+        The key columns that were indexed. By default None, i.e. entire rows were indexed.
+    """
+
+    fingerprints: np.ndarray
+    columns: List[str]
+    dtypes: Dict[str, str]
+    on: Optional[List[str]] = None
+
+    @classmethod
+    def from_dataframe(
+        cls, dataframe: pd.DataFrame, on: Optional[List[str]] = None
+    ) -> "SetIndex":
+        """Builds an index of the rows, or of the key columns, of a reference dataframe.
+
+        Parameters
+        ----------
+        dataframe : pd.DataFrame\n
+            The reference dataframe
+        on : Optional[List[str]], default None\n
+            Key columns that identify a row. By default None, i.e. entire rows are indexed.
+
+        Returns
+        -------
+        SetIndex\n
+
+        Raises
+        ------
+        KeyError\n
+            Raises KeyError if any of the columns in on is not a column of the dataframe.
+        """
+        on = list(on) if on else None
+        keys = _keys(dataframe, on)
+        return cls(
+            fingerprints=np.unique(_row_fingerprints(keys)),
+            columns=dataframe.columns.to_list(),
+            dtypes={column: str(dtype) for column, dtype in keys.dtypes.items()},
+            on=on,
+        )
+
+    def __len__(self) -> int:
+        return len(self.fingerprints)
+
+    def contains(self, batch: pd.DataFrame) -> np.ndarray:
+        """Returns a boolean mask over the rows of the batch whose row (or key) is found in the reference.
+
+        Parameters
+        ----------
+        batch : pd.DataFrame\n
+            A dataframe with the same columns as the reference, or at least the key columns if the index was built
+            with on.
+
+        Returns
+        -------
+        np.ndarray\n
+            A boolean array with one element per row of the batch
+
+        Raises
+        ------
+        ValueError\n
+            Raises ValueError if the index is built on entire rows and the columns of the batch are not those of
+            the reference.
+        KeyError\n
+            Raises KeyError if any of the key columns is not a column of the batch.
+        """
+        if self.on is None and batch.columns.to_list() != self.columns:
+            raise ValueError(
+                "The columns of the batch must be identical to the columns of the reference."
+            )
+        keys, valid = self._cast(_keys(batch, self.on))
+        fingerprints = _row_fingerprints(keys)
+        positions = np.searchsorted(self.fingerprints, fingerprints)
+        found = np.zeros(len(batch), dtype=bool)
+        inside = positions < len(self.fingerprints)
+        found[inside] = self.fingerprints[positions[inside]] == fingerprints[inside]
+        return found & valid
+
+    def difference(self, batch: pd.DataFrame) -> pd.DataFrame:
+        """The rows of the batch that are not in the reference. Duplicate rows of the batch are dropped.
+
+        Does not alter the original DataFrame.
+
+        Parameters
+        ----------
+        batch : pd.DataFrame\n
+            See contains
+
+        Returns
+        -------
+        pd.DataFrame\n
+            The set difference between the batch and the reference
+        """
+        return batch[~self.contains(batch) & _unique_rows(batch)]
+
+    def intersection(self, batch: pd.DataFrame) -> pd.DataFrame:
+        """The rows of the batch that are in the reference. Duplicate rows of the batch are dropped.
+
+        Does not alter the original DataFrame.
+
+        Parameters
+        ----------
+        batch : pd.DataFrame\n
+            See contains
+
+        Returns
+        -------
+        pd.DataFrame\n
+            The set intersection between the batch and the reference
+        """
+        return batch[self.contains(batch) & _unique_rows(batch)]
+
+    def save(self, path: Any) -> None:
+        """Saves the index to a directory. The fingerprints are stored as a .npy file, which load maps into
+        memory, and the columns and dtypes as json.
+
+        Parameters
+        ----------
+        path : Any\n
+            The directory, which is created if it does not exist
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        np.save(path / "fingerprints.npy", self.fingerprints)
+        with open(path / "index.json", "w") as f:
+            json.dump(
+                {"columns": self.columns, "dtypes": self.dtypes, "on": self.on}, f
+            )
+
+    @classmethod
+    def load(cls, path: Any, mmap: bool = True) -> "SetIndex":
+        """Loads an index saved by SetIndex.save.
+
+        Parameters
+        ----------
+        path : Any\n
+            The directory of the index
+        mmap : bool, default True\n
+            If True, the fingerprints are memory mapped read only, i.e. they are not read into memory and the
+            pages are shared by all processes that load the same index.
+
+        Returns
+        -------
+        SetIndex\n
+        """
+        path = Path(path)
+        with open(path / "index.json", "r") as f:
+            metadata = json.load(f)
+        fingerprints = np.load(
+            path / "fingerprints.npy", mmap_mode="r" if mmap else None
+        )
+        return cls(fingerprints=fingerprints, **metadata)
+
+    def _cast(self, keys: pd.DataFrame) -> Tuple[pd.DataFrame, np.ndarray]:
+        """Casts the columns of the batch to the dtypes of the reference, so that equal values get equal
+        fingerprints. Returns the cast keys and a mask of the rows whose values survive the cast unchanged. The other
+        rows, e.g. 1.5 in a batch compared to an integer reference, can not be in the reference.
+        """
+        valid = np.ones(len(keys), dtype=bool)
+        cast_columns = {}
+        for column, dtype in self.dtypes.items():
+            values = keys[column]
+            if str(values.dtype) == dtype:
+                continue
+            cast, survives = _cast_column(values, pd.api.types.pandas_dtype(dtype))
+            if cast is None:
+                valid[:] = False
+                continue
+            cast_columns[column] = cast
+            valid &= survives
+        if cast_columns:
+            keys = _replace_columns(keys, cast_columns)
+        return keys, valid
+
+
+def _keys(dataframe: pd.DataFrame, on: Optional[List[str]]) -> pd.DataFrame:
+    if not on:
+        return dataframe
+    missing = [column for column in on if column not in dataframe.columns]
+    if missing:
+        raise KeyError(
+            f"The following key columns are not found in the dataframe: {', '.join(map(str, missing))}"
+        )
+    return dataframe[on]
+
+
+
+def _cast_column(
+    values: pd.Series, dtype: Any
+) -> Tuple[Optional[pd.Series], np.ndarray]:
+    """Casts a column to dtype and returns it together with a mask of the values that survive the cast, i.e. that
+    are equal after a cast back to their own dtype. Missing values that can not be represented in dtype are
+    replaced before the cast and never survive. Returns None if the column can not be cast at all.
+    """
+    present = values.notna()
+    try:
+        cast = values.astype(dtype)
+        survives = np.ones(len(values), dtype=bool)
+    except (ValueError, TypeError):
+        if not present.any():
+            return None, np.zeros(len(values), dtype=bool)
+        try:
+            cast = values.where(present, values[present].iloc[0]).astype(dtype)
+        except (ValueError, TypeError):
+            return None, np.zeros(len(values), dtype=bool)
+        survives = present.to_numpy()
+    try:
+        back = cast.astype(values.dtype)
+    except (ValueError, TypeError):
+        return cast, survives
+    return cast, survives & _rows_equal(back.to_frame(), values.to_frame())
+
+
+def _replace_columns(keys: pd.DataFrame, columns: Dict[Any, pd.Series]) -> pd.DataFrame:
+    keys = keys.copy(deep=False)
+    for column, values in columns.items():
+        keys[column] = values
+    return keys
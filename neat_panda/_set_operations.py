@@ -1,15 +1,41 @@
 # -*- coding: utf-8 -*-
 
-from typing import Optional, List
+from typing import Optional, List, NamedTuple, Tuple, Union
 from dataclasses import dataclass
 
+import numpy as np
 import pandas as pd
 import pandas_flavor as pf
-from ._helpers import control_duplicates, control_value
+from ._helpers import (
+    _check_columns,
+    _warn_duplicates,
+    _align_dtypes,
+    _row_fingerprints,
+    _isin_rows,
+    _isin_rows_both,
+    _first_occurrences,
+    _row_codes,
+    _check_sorted,
+    _isin_sorted,
+    _sorted_first_occurrences,
+    _lookup,
+    _rows_equal,
+    _concat,
+)
+from ._parallel import _resolve_n_jobs, _isin_rows_parallel, _isin_rows_both_parallel
 
 
 @pf.register_dataframe_method
-def difference(dataframe1, dataframe2) -> pd.DataFrame:
+def difference(
+    dataframe1,
+    dataframe2,
+    on: Optional[List[str]] = None,
+    n_jobs: int = 1,
+    assume_unique: bool = False,
+    assume_sorted: bool = False,
+    mask: bool = False,
+    return_indexer: bool = False,
+) -> Union[pd.DataFrame, np.ndarray]:
     """The set difference between dataframe1 (S) and dataframe2 (T), i.e. it returns those elements that are in dataframe1
     but not in dataframe2. Formally S - T = {s|s ∈ S and s ∉ T}.
 
@@ -21,6 +47,26 @@ def difference(dataframe1, dataframe2) -> pd.DataFrame:
     ----------
     dataframe1 : pd.DataFrame\n
     dataframe2 : pd.DataFrame\n
+    on : Optional[List[str]], default None\n
+        Key columns that identify a row. If given, only the key columns are hashed and compared while the full rows are
+        returned. By default None, i.e. entire rows are compared.
+    n_jobs : int, default 1\n
+        The number of worker processes. If larger than 1, the row fingerprints are split into n_jobs hash partitions
+        that are looked up in parallel, using shared memory. -1 means one process per cpu. The order of the rows is the
+        same as with n_jobs=1.
+    assume_unique : bool, default False\n
+        If True, the dataframes are trusted to be free of duplicate rows and the duplicate check is skipped. Duplicates
+        are then neither dropped nor warned about.
+    assume_sorted : bool, default False\n
+        If True, both dataframes must be sorted ascending by the key columns (or by all columns if on is None), without
+        missing values in those columns. The rows are then matched with a merge walk (numpy searchsorted) instead of hash
+        tables, and n_jobs is ignored. Raises ValueError if the dataframes are not sorted.
+    mask : bool, default False\n
+        If True, a boolean numpy array over the rows of dataframe1 is returned instead of a dataframe, such that
+        dataframe1[mask] is the set difference. No dataframe is built.
+    return_indexer : bool, default False\n
+        If True, the positions of the rows of the set difference in dataframe1 are returned as an integer numpy array
+        instead of a dataframe, such that dataframe1.iloc[indexer] is the set difference. No dataframe is built.
 
     Returns
     -------
@@ -29,16 +75,34 @@ def difference(dataframe1, dataframe2) -> pd.DataFrame:
 
     Raises
     ------
+    ValueError\n
+        Raises ValueError if both mask and return_indexer are True.
     ValueError\n
         Raises ValueError if the columns in datframe1 and dataframe2 are not identical.
+    KeyError\n
+        Raises KeyError if any of the columns in on is not a column of the dataframes.
     """
-    return SetOperations(dataframe1, dataframe2).difference()
+    return SetOperations(dataframe1, dataframe2).difference(
+        on=on,
+        n_jobs=n_jobs,
+        assume_unique=assume_unique,
+        assume_sorted=assume_sorted,
+        mask=mask,
+        return_indexer=return_indexer,
+    )
 
 
 @pf.register_dataframe_method
 def symmetric_difference(
-    dataframe1, dataframe2, dataframe_names: Optional[List[str]] = None
-) -> pd.DataFrame:
+    dataframe1,
+    dataframe2,
+    dataframe_names: Optional[List[str]] = None,
+    on: Optional[List[str]] = None,
+    n_jobs: int = 1,
+    assume_unique: bool = False,
+    mask: bool = False,
+    return_indexer: bool = False,
+) -> Union[pd.DataFrame, Tuple[np.ndarray, np.ndarray]]:
     """The symmetric set difference between dataframe1 (S) and dataframe2 (T). It is the same as the union of the set difference between
     dataframe1 and dataframe2 and the set difference between dataframe2 and dataframe1. Formally A ⊕ B = (A - B) ∪ (B - A).
 
@@ -53,6 +117,22 @@ def symmetric_difference(
     dataframe_names : Optional[List[str]], default None\n
         The names given in the list is inserted in the returned dataframe in a column called 'original_dataframe'. The purpose
         of this column is to make it easier to track differences between the two dataframes.
+    on : Optional[List[str]], default None\n
+        Key columns that identify a row. If given, only the key columns are hashed and compared while the full rows are
+        returned. By default None, i.e. entire rows are compared.
+    n_jobs : int, default 1\n
+        The number of worker processes. If larger than 1, the row fingerprints are split into n_jobs hash partitions
+        that are looked up in parallel, using shared memory. -1 means one process per cpu. The order of the rows is the
+        same as with n_jobs=1.
+    assume_unique : bool, default False\n
+        If True, the dataframes are trusted to be free of duplicate rows and the duplicate check is skipped. Duplicates
+        are then neither dropped nor warned about.
+    mask : bool, default False\n
+        If True, a tuple of boolean numpy arrays over the rows of dataframe1 and dataframe2 is returned instead of a
+        dataframe, i.e. the rows of the symmetric difference from each dataframe. No dataframe is built.
+    return_indexer : bool, default False\n
+        If True, a tuple of integer numpy arrays with the positions of the rows of the symmetric difference in
+        dataframe1 and dataframe2 is returned instead of a dataframe. No dataframe is built.
 
     Returns
     -------
@@ -61,8 +141,12 @@ def symmetric_difference(
 
     Raises
     ------
+    ValueError\n
+        Raises ValueError if both mask and return_indexer are True.
     ValueError\n
         Raises ValueError if the columns in datframe1 and dataframe2 are not identical.
+    KeyError\n
+        Raises KeyError if any of the columns in on is not a column of the dataframes.
     ValueError\n
         Raises ValueError if the dataframe_names parameter is used and the length of the passed list is not 2.
 
@@ -97,12 +181,27 @@ def symmetric_difference(
     ```
     """
     return SetOperations(dataframe1, dataframe2).symmetric_difference(
-        dataframe_names=dataframe_names
+        dataframe_names=dataframe_names,
+        on=on,
+        n_jobs=n_jobs,
+        assume_unique=assume_unique,
+        mask=mask,
+        return_indexer=return_indexer,
     )
 
 
 @pf.register_dataframe_method
-def intersection(dataframe1, dataframe2) -> pd.DataFrame:
+def intersection(
+    dataframe1,
+    dataframe2,
+    on: Optional[List[str]] = None,
+    flag_conflicts: bool = False,
+    n_jobs: int = 1,
+    assume_unique: bool = False,
+    assume_sorted: bool = False,
+    mask: bool = False,
+    return_indexer: bool = False,
+) -> Union[pd.DataFrame, np.ndarray]:
     """The set intersection between dataframe1 (S) and dataframe2 (T), i.e. it returns the elements that are both in dataframe1
     and dataframe2. Formally S ∩ T = {s|s ∈ S and s ∈ T}.
 
@@ -114,6 +213,30 @@ def intersection(dataframe1, dataframe2) -> pd.DataFrame:
     ----------
     dataframe1 : pd.DataFrame\n
     dataframe2 : pd.DataFrame\n
+    on : Optional[List[str]], default None\n
+        Key columns that identify a row. If given, only the key columns are hashed and compared while the full rows are
+        returned. By default None, i.e. entire rows are compared.
+    flag_conflicts : bool, default False\n
+        Only used together with on. If True, a boolean column called 'payload_differs' is added to the returned dataframe.
+        It is True for the rows whose key is found in dataframe2 while the full row is not, i.e. rows whose key matches but
+        whose payload differs.
+    n_jobs : int, default 1\n
+        The number of worker processes. If larger than 1, the row fingerprints are split into n_jobs hash partitions
+        that are looked up in parallel, using shared memory. -1 means one process per cpu. The order of the rows is the
+        same as with n_jobs=1.
+    assume_unique : bool, default False\n
+        If True, the dataframes are trusted to be free of duplicate rows and the duplicate check is skipped. Duplicates
+        are then neither dropped nor warned about.
+    assume_sorted : bool, default False\n
+        If True, both dataframes must be sorted ascending by the key columns (or by all columns if on is None), without
+        missing values in those columns. The rows are then matched with a merge walk (numpy searchsorted) instead of hash
+        tables, and n_jobs is ignored. Raises ValueError if the dataframes are not sorted.
+    mask : bool, default False\n
+        If True, a boolean numpy array over the rows of dataframe1 is returned instead of a dataframe, such that
+        dataframe1[mask] is the set intersection (with the index of dataframe1). No dataframe is built.
+    return_indexer : bool, default False\n
+        If True, the positions of the rows of the set intersection in dataframe1 are returned as an integer numpy array
+        instead of a dataframe. No dataframe is built.
 
     Returns
     -------
@@ -122,37 +245,69 @@ def intersection(dataframe1, dataframe2) -> pd.DataFrame:
 
     Raises
     ------
+    ValueError\n
+        Raises ValueError if both mask and return_indexer are True.
     ValueError\n
         Raises ValueError if the columns in datframe1 and dataframe2 are not identical.
+    KeyError\n
+        Raises KeyError if any of the columns in on is not a column of the dataframes.
     """
-    return SetOperations(dataframe1, dataframe2).intersection()
+    return SetOperations(dataframe1, dataframe2).intersection(
+        on=on,
+        flag_conflicts=flag_conflicts,
+        n_jobs=n_jobs,
+        assume_unique=assume_unique,
+        assume_sorted=assume_sorted,
+        mask=mask,
+        return_indexer=return_indexer,
+    )
 
 
 @pf.register_dataframe_method
-def union(dataframe1, dataframe2) -> pd.DataFrame:
-    """The set union between dataframe1 (S) and dataframe2 (T), i.e. it returns the elements that are both in dataframe1
-    and dataframe2. Formally S ∩ T = {s|s ∈ S and s ∈ T}.
+def union(
+    dataframe1,
+    dataframe2,
+    on: Optional[List[str]] = None,
+    assume_unique: bool = False,
+    distinct: bool = False,
+    ignore_index: bool = True,
+) -> pd.DataFrame:
+    """The set union between dataframe1 (S) and dataframe2 (T), i.e. it returns the elements that are in dataframe1,
+    in dataframe2 or in both. Formally S ∪ T = {s|s ∈ S or s ∈ T}.
 
-    If duplicates exists in either dataframe they are dropped and a UserWarning is issued.
+    By default the dataframes are concatenated with pandas concat, i.e. all rows are returned. If distinct is True, or
+    if on is given, the rows of dataframe2 that are found in dataframe1 are left out, based on row fingerprints.
+    Duplicates are then dropped and a UserWarning is issued.
 
     Does not alter the original DataFrame.
 
-    Syntactic sugar for the pandas dataframe append method.
-
     Parameters
     ----------
     dataframe1 : pd.DataFrame\n
     dataframe2 : pd.DataFrame\n
+    on : Optional[List[str]], default None\n
+        Key columns that identify a row. If given, only the key columns are hashed and compared while the full rows are
+        returned. By default None, i.e. entire rows are compared.
+    assume_unique : bool, default False\n
+        If True, the dataframes are trusted to be free of duplicate rows and the duplicate check is skipped. Duplicates
+        are then neither dropped nor warned about.
+    distinct : bool, default False\n
+        If True, the union is distinct, i.e. each row is returned once. If False, all rows of both dataframes are
+        returned and nothing is fingerprinted.
+    ignore_index : bool, default True\n
+        If True, the returned dataframe gets a new RangeIndex. If False, the indexes of the dataframes are kept.
 
     Returns
     -------
     pandas DataFrame\n
-        The set difference between dataframe1 and dataframe2
+        The set union between dataframe1 and dataframe2
 
     Raises
     ------
     ValueError\n
         Raises ValueError if the columns in datframe1 and dataframe2 are not identical.
+    KeyError\n
+        Raises KeyError if any of the columns in on is not a column of the dataframes.
 
     Example
     -------
@@ -184,7 +339,211 @@ def union(dataframe1, dataframe2) -> pd.DataFrame:
     4   Denmark  Not known  2020       3
     ```
     """
-    return SetOperations(dataframe1, dataframe2).union()
+    return SetOperations(dataframe1, dataframe2).union(
+        on=on,
+        assume_unique=assume_unique,
+        distinct=distinct,
+        ignore_index=ignore_index,
+    )
+
+
+def diff(df_old: pd.DataFrame, df_new: pd.DataFrame, on: List[str]) -> pd.DataFrame:
+    """Row level change detection between two versions of a dataframe. Each key is classified as inserted (only in
+    df_new), deleted (only in df_old), updated (in both, with different values) or unchanged.
+
+    The keys are fingerprinted once and matched in one hashed pass, and the matched rows are compared column by
+    column with vectorized comparisons.
+
+    Does not alter the original DataFrames.
+
+    Parameters
+    ----------
+    df_old : pd.DataFrame\n
+    df_new : pd.DataFrame\n
+    on : List[str]\n
+        Key columns that identify a row. The keys must be unique within each dataframe.
+
+    Returns
+    -------
+    pandas DataFrame\n
+        The rows of df_new, followed by the deleted rows of df_old, with two additional columns. 'change' is one of
+        'inserted', 'deleted', 'updated' and 'unchanged', and 'changed_columns' is a list of the columns whose values
+        differ for updated rows (an empty list for the other rows).
+
+    Raises
+    ------
+    ValueError\n
+        Raises ValueError if the columns in df_old and df_new are not identical, if on is empty or if the keys are
+        not unique.
+    KeyError\n
+        Raises KeyError if any of the columns in on is not a column of the dataframes.
+
+    Example
+    -------
+    ```python
+    import pandas as pd
+    import neat_panda
+
+    print(df_old)
+
+       id  value
+    0   1      a
+    1   2      b
+    2   3      c
+
+    print(df_new)
+
+       id  value
+    0   1      a
+    1   3      x
+    2   4      d
+
+    print(neat_panda.diff(df_old, df_new, on=["id"]))
+
+       id value     change changed_columns
+    0   1     a  unchanged              []
+    1   3     x    updated         [value]
+    2   4     d   inserted              []
+    3   2     b    deleted              []
+    ```
+    """
+    return SetOperations(df_old, df_new).diff(on=on)
+
+
+def union_all(frames: List[pd.DataFrame], distinct: bool = True) -> pd.DataFrame:
+    """The set union of any number of dataframes, i.e. it returns the rows that are in at least one of the dataframes.
+
+    Each dataframe is fingerprinted exactly once, and the first occurrence of each row is kept, in the order of the
+    dataframes. This is faster than chaining union, which fingerprints the growing intermediate result at every step.
+
+    Does not alter the original DataFrames.
+
+    Parameters
+    ----------
+    frames : List[pd.DataFrame]\n
+        The dataframes. If the columnnames differ from those of the first dataframe they are renamed to match them.
+    distinct : bool, default True\n
+        If True, duplicate rows are dropped. If False, all rows are returned and nothing is fingerprinted.
+
+    Returns
+    -------
+    pandas DataFrame\n
+        The set union of the dataframes
+
+    Raises
+    ------
+    ValueError\n
+        Raises ValueError if no dataframe is given or if the number of columns in the dataframes are not identical.
+    """
+    frames = _check_frames(frames)
+    if not distinct:
+        return _concat(frames, ignore_index=True)
+    codes = _frame_codes(frames)
+    first = ~pd.Index(np.concatenate(codes)).duplicated()
+    offsets = np.cumsum([0] + [len(frame) for frame in frames])
+    return _concat(
+        [
+            _select(frame, first[offsets[i] : offsets[i + 1]])
+            for i, frame in enumerate(frames)
+        ],
+        ignore_index=True,
+    )
+
+
+def intersection_all(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """The set intersection of any number of dataframes, i.e. it returns the rows of the first dataframe that are in
+    all of the dataframes. Duplicate rows are dropped.
+
+    Each dataframe is fingerprinted exactly once, and the number of dataframes in which each row occurs is counted
+    per fingerprint.
+
+    Does not alter the original DataFrames.
+
+    Parameters
+    ----------
+    frames : List[pd.DataFrame]\n
+        The dataframes. If the columnnames differ from those of the first dataframe they are renamed to match them.
+
+    Returns
+    -------
+    pandas DataFrame\n
+        The set intersection of the dataframes
+
+    Raises
+    ------
+    ValueError\n
+        Raises ValueError if no dataframe is given or if the number of columns in the dataframes are not identical.
+    """
+    frames = _check_frames(frames)
+    codes = _frame_codes(frames)
+    occurrences = np.zeros(max(int(c.max(initial=-1)) for c in codes) + 1, dtype=np.intp)
+    for frame_codes in codes:
+        occurrences[np.unique(frame_codes)] += 1
+    mask = (occurrences[codes[0]] == len(frames)) & ~pd.Index(codes[0]).duplicated()
+    return frames[0][mask].reset_index(drop=True)
+
+
+def difference_all(base: pd.DataFrame, others: List[pd.DataFrame]) -> pd.DataFrame:
+    """The set difference between base and any number of dataframes, i.e. it returns the rows of base that are in
+    none of the other dataframes. Duplicate rows are dropped.
+
+    Each dataframe is fingerprinted exactly once.
+
+    Does not alter the original DataFrames.
+
+    Parameters
+    ----------
+    base : pd.DataFrame\n
+    others : List[pd.DataFrame]\n
+        The dataframes whose rows are removed from base. If the columnnames differ from those of base they are
+        renamed to match them.
+
+    Returns
+    -------
+    pandas DataFrame\n
+        The set difference between base and the other dataframes
+
+    Raises
+    ------
+    ValueError\n
+        Raises ValueError if the number of columns in the dataframes are not identical.
+    """
+    frames = _check_frames([base] + list(others))
+    codes = _frame_codes(frames)
+    in_others = np.zeros(max(int(c.max(initial=-1)) for c in codes) + 1, dtype=bool)
+    for frame_codes in codes[1:]:
+        in_others[frame_codes] = True
+    return base[~in_others[codes[0]] & ~pd.Index(codes[0]).duplicated()]
+
+
+def _check_frames(frames: List[pd.DataFrame]) -> List[pd.DataFrame]:
+    frames = list(frames)
+    if not frames:
+        raise ValueError("At least one dataframe must be given")
+    if not all(isinstance(frame, pd.DataFrame) for frame in frames):
+        raise TypeError("All frames must be pandas DataFrames")
+    return [frames[0]] + [_check_columns(frames[0], frame) for frame in frames[1:]]
+
+
+def _frame_codes(frames: List[pd.DataFrame]) -> List[np.ndarray]:
+    """Aligns the dtypes of the dataframes, fingerprints each of them once and returns exact row codes that are
+    shared between the dataframes.
+    """
+    aligned = _align_dtypes(*frames)
+    return _row_codes(aligned, [_row_fingerprints(frame) for frame in aligned])
+
+
+def _select(df: pd.DataFrame, mask: np.ndarray) -> pd.DataFrame:
+    return df if mask.all() else df[mask]
+
+
+def _check_indexer_options(mask: bool, return_indexer: bool) -> None:
+    if mask and return_indexer:
+        raise ValueError("Only one of mask and return_indexer can be True")
+
+
+def _indexer(selected: np.ndarray, return_indexer: bool) -> np.ndarray:
+    return np.flatnonzero(selected) if return_indexer else selected
 
 
 @dataclass
@@ -192,9 +551,15 @@ class SetOperations:
     dataframe1: pd.DataFrame
     dataframe2: pd.DataFrame
 
-    @control_value
-    @control_duplicates
-    def difference(self) -> pd.DataFrame:
+    def difference(
+        self,
+        on: Optional[List[str]] = None,
+        n_jobs: int = 1,
+        assume_unique: bool = False,
+        assume_sorted: bool = False,
+        mask: bool = False,
+        return_indexer: bool = False,
+    ) -> Union[pd.DataFrame, np.ndarray]:
         """The set difference between dataframe1 (S) and dataframe2 (T), i.e. it returns those elements that are in dataframe1
         but not in dataframe2. Formally S - T = {s|s ∈ S and s ∉ T}.
 
@@ -206,9 +571,30 @@ class SetOperations:
         ----------
         dataframe1 : pd.DataFrame\n
         dataframe2 : pd.DataFrame\n
-
-        The code is copied from the users WeNYoBen answer to the question "Python Pandas - Find difference between two data
-        frames" at [StackOverflow](https://stackoverflow.com/questions/48647534/python-pandas-find-difference-between-two-data-frames)
+        on : Optional[List[str]], default None\n
+            Key columns that identify a row. If given, only the key columns are hashed and compared while the full rows are
+            returned. By default None, i.e. entire rows are compared.
+        n_jobs : int, default 1\n
+            The number of worker processes. If larger than 1, the row fingerprints are split into n_jobs hash partitions
+            that are looked up in parallel, using shared memory. -1 means one process per cpu. The order of the rows is the
+            same as with n_jobs=1.
+        assume_unique : bool, default False\n
+            If True, the dataframes are trusted to be free of duplicate rows and the duplicate check is skipped. Duplicates
+            are then neither dropped nor warned about.
+        assume_sorted : bool, default False\n
+            If True, both dataframes must be sorted ascending by the key columns (or by all columns if on is None), without
+            missing values in those columns. The rows are then matched with a merge walk (numpy searchsorted) instead of hash
+            tables, and n_jobs is ignored. Raises ValueError if the dataframes are not sorted.
+        mask : bool, default False\n
+            If True, a boolean numpy array over the rows of dataframe1 is returned instead of a dataframe, such that
+            dataframe1[mask] is the set difference. No dataframe is built.
+        return_indexer : bool, default False\n
+            If True, the positions of the rows of the set difference in dataframe1 are returned as an integer numpy array
+            instead of a dataframe, such that dataframe1.iloc[indexer] is the set difference. No dataframe is built.
+
+        Each row is reduced to a 64-bit fingerprint, computed once per dataframe, and the rows of dataframe1 whose
+        fingerprint is found among the fingerprints of dataframe2 are dropped. Rows with equal fingerprints are
+        verified to be equal, hence fingerprint collisions do not affect the result.
 
         Returns
         -------
@@ -217,18 +603,30 @@ class SetOperations:
 
         Raises
         ------
+        ValueError\n
+            Raises ValueError if both mask and return_indexer are True.
         ValueError\n
             Raises ValueError if the columns in datframe1 and dataframe2 are not identical.
+        KeyError\n
+            Raises KeyError if any of the columns in on is not a column of the dataframes.
         """
-        return pd.concat(
-            [self.dataframe1, self.dataframe2, self.dataframe2]
-        ).drop_duplicates(keep=False)
+        _check_indexer_options(mask, return_indexer)
+        prepared = self._prepare(on, assume_unique, assume_sorted)
+        isin = self._isin(prepared, n_jobs)
+        selected = ~isin & prepared.unique1
+        if mask or return_indexer:
+            return _indexer(selected, return_indexer)
+        return prepared.original1[selected]
 
-    @control_value
-    @control_duplicates
     def symmetric_difference(
-        self, dataframe_names: Optional[List[str]] = None
-    ) -> pd.DataFrame:
+        self,
+        dataframe_names: Optional[List[str]] = None,
+        on: Optional[List[str]] = None,
+        n_jobs: int = 1,
+        assume_unique: bool = False,
+        mask: bool = False,
+        return_indexer: bool = False,
+    ) -> Union[pd.DataFrame, Tuple[np.ndarray, np.ndarray]]:
         """The symmetric set difference between dataframe1 (S) and dataframe2 (T). It is the same as the union of the set difference between
         dataframe1 and dataframe2 and the set difference between dataframe2 and dataframe1. Formally A ⊕ B = (A - B) ∪ (B - A).
 
@@ -243,6 +641,22 @@ class SetOperations:
         dataframe_names : Optional[List[str]], default None\n
             The names given in the list is inserted in the returned dataframe in a column called 'original_dataframe'. The purpose
             of this column is to make it easier to track differences between the two dataframes.
+        on : Optional[List[str]], default None\n
+            Key columns that identify a row. If given, only the key columns are hashed and compared while the full rows are
+            returned. By default None, i.e. entire rows are compared.
+        n_jobs : int, default 1\n
+            The number of worker processes. If larger than 1, the row fingerprints are split into n_jobs hash partitions
+            that are looked up in parallel, using shared memory. -1 means one process per cpu. The order of the rows is the
+            same as with n_jobs=1.
+        assume_unique : bool, default False\n
+            If True, the dataframes are trusted to be free of duplicate rows and the duplicate check is skipped. Duplicates
+            are then neither dropped nor warned about.
+        mask : bool, default False\n
+            If True, a tuple of boolean numpy arrays over the rows of dataframe1 and dataframe2 is returned instead of a
+            dataframe, i.e. the rows of the symmetric difference from each dataframe. No dataframe is built.
+        return_indexer : bool, default False\n
+            If True, a tuple of integer numpy arrays with the positions of the rows of the symmetric difference in
+            dataframe1 and dataframe2 is returned instead of a dataframe. No dataframe is built.
 
         Returns
         -------
@@ -251,29 +665,47 @@ class SetOperations:
 
         Raises
         ------
+        ValueError\n
+            Raises ValueError if both mask and return_indexer are True.
         ValueError\n
             Raises ValueError if the columns in datframe1 and dataframe2 are not identical.
+        KeyError\n
+            Raises KeyError if any of the columns in on is not a column of the dataframes.
         ValueError\n
             Raises ValueError if the dataframe_names parameter is used and the length of the passed list is not 2.
+
+        Both dataframes are fingerprinted once and the membership of the rows of both dataframes is computed from
+        one shared hash table of the fingerprints.
         """
         if dataframe_names and len(dataframe_names) != 2:
             raise ValueError("Only two dataframe names")
-        df1 = self.difference()
-        self._swap_dataframes()
-        df2 = self.difference()
+        _check_indexer_options(mask, return_indexer)
+        prepared = self._prepare(on, assume_unique)
+        isin1, isin2 = self._isin_both(prepared, n_jobs)
+        selected1 = ~isin1 & prepared.unique1
+        selected2 = ~isin2 & prepared.unique2
+        if mask or return_indexer:
+            return (
+                _indexer(selected1, return_indexer),
+                _indexer(selected2, return_indexer),
+            )
+        df1 = prepared.original1[selected1]
+        df2 = prepared.original2[selected2]
         if dataframe_names:
-            df1["original_dataframe"] = dataframe_names[0]
-            df2["original_dataframe"] = dataframe_names[1]
-        return pd.concat([df1, df2]).reset_index(drop=True)
-
-    def _swap_dataframes(self):
-        temp = self.dataframe1.copy()
-        self.dataframe1 = self.dataframe2.copy()
-        self.dataframe2 = temp.copy()
-
-    @control_value
-    @control_duplicates
-    def intersection(self) -> pd.DataFrame:
+            df1 = df1.assign(original_dataframe=dataframe_names[0])
+            df2 = df2.assign(original_dataframe=dataframe_names[1])
+        return _concat([df1, df2], ignore_index=True)
+
+    def intersection(
+        self,
+        on: Optional[List[str]] = None,
+        flag_conflicts: bool = False,
+        n_jobs: int = 1,
+        assume_unique: bool = False,
+        assume_sorted: bool = False,
+        mask: bool = False,
+        return_indexer: bool = False,
+    ) -> Union[pd.DataFrame, np.ndarray]:
         """The set intersection between dataframe1 (S) and dataframe2 (T), i.e. it returns the elements that are both in dataframe1
         and dataframe2. Formally S ∩ T = {s|s ∈ S and s ∈ T}.
 
@@ -285,6 +717,30 @@ class SetOperations:
         ----------
         dataframe1 : pd.DataFrame\n
         dataframe2 : pd.DataFrame\n
+        on : Optional[List[str]], default None\n
+            Key columns that identify a row. If given, only the key columns are hashed and compared while the full rows are
+            returned. By default None, i.e. entire rows are compared.
+        flag_conflicts : bool, default False\n
+            Only used together with on. If True, a boolean column called 'payload_differs' is added to the returned dataframe.
+            It is True for the rows whose key is found in dataframe2 while the full row is not, i.e. rows whose key matches but
+            whose payload differs.
+        n_jobs : int, default 1\n
+            The number of worker processes. If larger than 1, the row fingerprints are split into n_jobs hash partitions
+            that are looked up in parallel, using shared memory. -1 means one process per cpu. The order of the rows is the
+            same as with n_jobs=1.
+        assume_unique : bool, default False\n
+            If True, the dataframes are trusted to be free of duplicate rows and the duplicate check is skipped. Duplicates
+            are then neither dropped nor warned about.
+        assume_sorted : bool, default False\n
+            If True, both dataframes must be sorted ascending by the key columns (or by all columns if on is None), without
+            missing values in those columns. The rows are then matched with a merge walk (numpy searchsorted) instead of hash
+            tables, and n_jobs is ignored. Raises ValueError if the dataframes are not sorted.
+        mask : bool, default False\n
+            If True, a boolean numpy array over the rows of dataframe1 is returned instead of a dataframe, such that
+            dataframe1[mask] is the set intersection (with the index of dataframe1). No dataframe is built.
+        return_indexer : bool, default False\n
+            If True, the positions of the rows of the set intersection in dataframe1 are returned as an integer numpy array
+            instead of a dataframe. No dataframe is built.
 
         Returns
         -------
@@ -293,41 +749,292 @@ class SetOperations:
 
         Raises
         ------
+        ValueError\n
+            Raises ValueError if both mask and return_indexer are True.
         ValueError\n
             Raises ValueError if the columns in datframe1 and dataframe2 are not identical.
+        KeyError\n
+            Raises KeyError if any of the columns in on is not a column of the dataframes.
         """
-        return self.dataframe1.merge(right=self.dataframe2, how="inner").reset_index(
-            drop=True
-        )
+        _check_indexer_options(mask, return_indexer)
+        if flag_conflicts and (mask or return_indexer):
+            raise ValueError(
+                "flag_conflicts can not be combined with mask or return_indexer"
+            )
+        prepared = self._prepare(on, assume_unique, assume_sorted)
+        isin = self._isin(prepared, n_jobs)
+        selected = isin & prepared.unique1
+        if mask or return_indexer:
+            return _indexer(selected, return_indexer)
+        df = prepared.original1[selected]
+        if on and flag_conflicts:
+            row_fingerprints1, row_fingerprints2 = prepared.row_fingerprints1, prepared.row_fingerprints2
+            if row_fingerprints1 is None:
+                row_fingerprints1 = _row_fingerprints(prepared.dataframe1)
+                row_fingerprints2 = _row_fingerprints(prepared.dataframe2)
+            rows_isin = _isin_rows(
+                prepared.dataframe1[selected],
+                prepared.dataframe2,
+                row_fingerprints1[selected],
+                row_fingerprints2,
+            )
+            df = df.assign(payload_differs=~rows_isin)
+        return df.reset_index(drop=True)
+
+    def union(
+        self,
+        on: Optional[List[str]] = None,
+        assume_unique: bool = False,
+        distinct: bool = False,
+        ignore_index: bool = True,
+    ) -> pd.DataFrame:
+        """The set union between dataframe1 (S) and dataframe2 (T), i.e. it returns the elements that are in dataframe1,
+        in dataframe2 or in both. Formally S ∪ T = {s|s ∈ S or s ∈ T}.
 
-    @control_value
-    @control_duplicates
-    def union(self) -> pd.DataFrame:
-        """The set union between dataframe1 (S) and dataframe2 (T), i.e. it returns the elements that are both in dataframe1
-        and dataframe2. Formally S ∩ T = {s|s ∈ S and s ∈ T}.
-
-        If duplicates exists in either dataframe they are dropped and a UserWarning is issued.
+        By default the dataframes are concatenated with pandas concat, i.e. all rows are returned. If distinct is True, or
+        if on is given, the rows of dataframe2 that are found in dataframe1 are left out, based on row fingerprints.
+        Duplicates are then dropped and a UserWarning is issued.
 
         Does not alter the original DataFrame.
 
-        Syntactic sugar for the pandas dataframe append method.
-
         Parameters
         ----------
         dataframe1 : pd.DataFrame\n
         dataframe2 : pd.DataFrame\n
+        on : Optional[List[str]], default None\n
+            Key columns that identify a row. If given, only the key columns are hashed and compared while the full rows are
+            returned. By default None, i.e. entire rows are compared.
+        assume_unique : bool, default False\n
+            If True, the dataframes are trusted to be free of duplicate rows and the duplicate check is skipped. Duplicates
+            are then neither dropped nor warned about.
+        distinct : bool, default False\n
+            If True, the union is distinct, i.e. each row is returned once. If False, all rows of both dataframes are
+            returned and nothing is fingerprinted.
+        ignore_index : bool, default True\n
+            If True, the returned dataframe gets a new RangeIndex. If False, the indexes of the dataframes are kept.
 
         Returns
         -------
         pandas DataFrame\n
-            The set difference between dataframe1 and dataframe2
+            The set union between dataframe1 and dataframe2
 
         Raises
         ------
         ValueError\n
             Raises ValueError if the columns in datframe1 and dataframe2 are not identical.
+        KeyError\n
+            Raises KeyError if any of the columns in on is not a column of the dataframes.
+        """
+        if not on and not distinct:
+            dataframe2 = _check_columns(self.dataframe1, self.dataframe2)
+            return _concat([self.dataframe1, dataframe2], ignore_index=ignore_index)
+        prepared = self._prepare(on, assume_unique)
+        isin = _isin_rows(
+            prepared.keys2, prepared.keys1, prepared.key_fingerprints2, prepared.key_fingerprints1
+        )
+        return _concat(
+            [
+                _select(prepared.original1, prepared.unique1),
+                _select(prepared.original2, ~isin & prepared.unique2),
+            ],
+            ignore_index=ignore_index,
+        )
+
+    def diff(self, on: List[str]) -> pd.DataFrame:
+        """Row level change detection from dataframe1 (the old version) to dataframe2 (the new version). See diff.
+
+        Parameters
+        ----------
+        on : List[str]\n
+            Key columns that identify a row. The keys must be unique within each dataframe.
+
+        Returns
+        -------
+        pandas DataFrame\n
+            The rows of dataframe2, followed by the deleted rows of dataframe1, with the columns 'change' and
+            'changed_columns'.
+
+        Raises
+        ------
+        ValueError\n
+            Raises ValueError if the columns in dataframe1 and dataframe2 are not identical, if on is empty or if
+            the keys are not unique.
+        KeyError\n
+            Raises KeyError if any of the columns in on is not a column of the dataframes.
         """
-        return self.dataframe1.append(self.dataframe2).reset_index(drop=True)
+        if not on:
+            raise ValueError("diff requires at least one key column")
+        prepared = self._prepare(on, assume_unique=True)
+        for keys, fingerprints, name in (
+            (prepared.keys1, prepared.key_fingerprints1, "dataframe1"),
+            (prepared.keys2, prepared.key_fingerprints2, "dataframe2"),
+        ):
+            if not _first_occurrences(keys, fingerprints).all():
+                raise ValueError(f"The keys of {name} are not unique")
+        match = _lookup(prepared.key_fingerprints2, prepared.key_fingerprints1)
+        candidates = np.flatnonzero(match >= 0)
+        equal = _rows_equal(
+            prepared.keys2.iloc[candidates], prepared.keys1.iloc[match[candidates]]
+        )
+        match[candidates[~equal]] = -1
+        collisions = candidates[~equal]
+        if len(collisions):
+            shared = np.flatnonzero(
+                np.isin(prepared.key_fingerprints1, prepared.key_fingerprints2[collisions])
+            )
+            for position in collisions:
+                same = _rows_equal(
+                    prepared.keys1.iloc[shared],
+                    prepared.keys2.iloc[np.repeat(position, len(shared))],
+                )
+                if same.any():
+                    match[position] = shared[np.argmax(same)]
+        new_positions = np.flatnonzero(match >= 0)
+        old_positions = match[new_positions]
+        columns = [c for c in prepared.dataframe2.columns if c not in set(on)]
+        changed = np.zeros((len(new_positions), len(columns)), dtype=bool)
+        for j, column in enumerate(columns):
+            changed[:, j] = ~_rows_equal(
+                prepared.dataframe2[[column]].iloc[new_positions],
+                prepared.dataframe1[[column]].iloc[old_positions],
+            )
+        updated = changed.any(axis=1)
+        change = np.full(len(match), "inserted", dtype=object)
+        change[new_positions] = np.where(updated, "updated", "unchanged")
+        names = np.array(columns, dtype=object)
+        changed_columns = [[] for _ in range(len(match))]
+        for position, row in zip(new_positions[updated], changed[updated]):
+            changed_columns[position] = names[row].tolist()
+        deleted = np.ones(len(prepared.original1), dtype=bool)
+        deleted[old_positions] = False
+        n_deleted = int(deleted.sum())
+        return _concat(
+            [
+                prepared.original2.assign(change=change, changed_columns=changed_columns),
+                prepared.original1[deleted].assign(
+                    change="deleted", changed_columns=[[] for _ in range(n_deleted)]
+                ),
+            ],
+            ignore_index=True,
+        )
+
+    @staticmethod
+    def _isin(prepared: "_PreparedFrames", n_jobs: int = 1) -> np.ndarray:
+        """Returns a boolean mask over the rows of dataframe1 whose key is found in dataframe2.
+        """
+        if prepared.key_fingerprints1 is None:
+            return _isin_sorted(prepared.keys1, prepared.keys2)
+        args = (
+            prepared.keys1,
+            prepared.keys2,
+            prepared.key_fingerprints1,
+            prepared.key_fingerprints2,
+        )
+        n_jobs = _resolve_n_jobs(n_jobs)
+        if n_jobs == 1:
+            return _isin_rows(*args)
+        return _isin_rows_parallel(*args, n_jobs)
+
+    @staticmethod
+    def _isin_both(
+        prepared: "_PreparedFrames", n_jobs: int = 1
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns boolean masks over the rows of dataframe1 whose key is found in dataframe2 and over the rows of
+        dataframe2 whose key is found in dataframe1.
+        """
+        args = (
+            prepared.keys1,
+            prepared.keys2,
+            prepared.key_fingerprints1,
+            prepared.key_fingerprints2,
+        )
+        n_jobs = _resolve_n_jobs(n_jobs)
+        if n_jobs == 1:
+            return _isin_rows_both(*args)
+        return _isin_rows_both_parallel(*args, n_jobs)
+
+    def _prepare(
+        self,
+        on: Optional[List[str]] = None,
+        assume_unique: bool = False,
+        assume_sorted: bool = False,
+    ) -> "_PreparedFrames":
+        """Validates the dataframes and computes what the set operations need in one pass. The columns are checked,
+        the dtypes are aligned and each row is fingerprinted once. The masks of the first occurrence of each row are
+        derived from the fingerprints, and a UserWarning is issued if there are duplicates. If assume_unique is True
+        the duplicate check is skipped, and rows are only fingerprinted if they are compared.
+
+        If assume_sorted is True the keys are checked to be sorted and nothing is fingerprinted, except the rows when
+        duplicates must be found and on is given. The key fingerprints are then None. Without on, duplicates are
+        adjacent and found by comparing each row with the previous one.
+        """
+        original1 = self.dataframe1
+        original2 = _check_columns(self.dataframe1, self.dataframe2)
+        dataframe1, dataframe2 = _align_dtypes(original1, original2)
+        if on:
+            missing = [column for column in on if column not in dataframe1.columns]
+            if missing:
+                raise KeyError(
+                    f"The following key columns are not found in the dataframes: {', '.join(map(str, missing))}"
+                )
+            keys1, keys2 = dataframe1[on], dataframe2[on]
+        else:
+            keys1, keys2 = dataframe1, dataframe2
+        if assume_sorted:
+            _check_sorted(keys1, "dataframe1")
+            _check_sorted(keys2, "dataframe2")
+        row_fingerprints1, row_fingerprints2 = None, None
+        if (not on and not assume_sorted) or (on and not assume_unique):
+            row_fingerprints1 = _row_fingerprints(dataframe1)
+            row_fingerprints2 = _row_fingerprints(dataframe2)
+        key_fingerprints1, key_fingerprints2 = None, None
+        if on and not assume_sorted:
+            key_fingerprints1 = _row_fingerprints(keys1)
+            key_fingerprints2 = _row_fingerprints(keys2)
+        elif not on:
+            key_fingerprints1, key_fingerprints2 = row_fingerprints1, row_fingerprints2
+        if assume_unique:
+            unique1 = np.ones(len(dataframe1), dtype=bool)
+            unique2 = np.ones(len(dataframe2), dtype=bool)
+        elif row_fingerprints1 is None:
+            unique1 = _sorted_first_occurrences(dataframe1)
+            unique2 = _sorted_first_occurrences(dataframe2)
+            _warn_duplicates(len(unique1) - int(unique1.sum()), "dataframe1")
+            _warn_duplicates(len(unique2) - int(unique2.sum()), "dataframe2")
+        else:
+            unique1 = _first_occurrences(dataframe1, row_fingerprints1)
+            unique2 = _first_occurrences(dataframe2, row_fingerprints2)
+            _warn_duplicates(len(unique1) - int(unique1.sum()), "dataframe1")
+            _warn_duplicates(len(unique2) - int(unique2.sum()), "dataframe2")
+        return _PreparedFrames(
+            original1,
+            original2,
+            dataframe1,
+            dataframe2,
+            keys1,
+            keys2,
+            row_fingerprints1,
+            row_fingerprints2,
+            key_fingerprints1,
+            key_fingerprints2,
+            unique1,
+            unique2,
+        )
+
+
+class _PreparedFrames(NamedTuple):
+    original1: pd.DataFrame
+    original2: pd.DataFrame
+    dataframe1: pd.DataFrame
+    dataframe2: pd.DataFrame
+    keys1: pd.DataFrame
+    keys2: pd.DataFrame
+    row_fingerprints1: Optional[np.ndarray]
+    row_fingerprints2: Optional[np.ndarray]
+    key_fingerprints1: Optional[np.ndarray]
+    key_fingerprints2: Optional[np.ndarray]
+    unique1: np.ndarray
+    unique2: np.ndarray
 
 
 if __name__ == "__main__":
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+
+from typing import Any, Iterable, List, Optional, Union
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from ._helpers import _stable_fingerprints, _mix_fingerprints
+
+
+_SKETCH_SEED = 47
+
+
+def sketch(
+    data: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+    on: Optional[List[str]] = None,
+    precision: int = 14,
+) -> "Sketch":
+    """Builds a HyperLogLog sketch of the distinct rows, or keys, of a dataframe or of an iterable of dataframe
+    chunks in one streaming pass. Sketches are small (2**precision bytes), mergeable and estimate the cardinality
+    of unions, intersections and differences between large dataframes in milliseconds, e.g. to decide whether a
+    set operation fits in memory.
+
+    Parameters
+    ----------
+    data : Union[pd.DataFrame, Iterable[pd.DataFrame]]\n
+        A dataframe or an iterable of dataframe chunks
+    on : Optional[List[str]], default None\n
+        Key columns that identify a row. By default None, i.e. entire rows are counted.
+    precision : int, default 14\n
+        The number of bits used to pick a register, between 4 and 18. The sketch has 2**precision registers and the
+        relative standard error of an estimate is about 1.04 / sqrt(2**precision), i.e. 0.8% by default.
+
+    Returns
+    -------
+    Sketch\n
+
+    Example
+    -------
+    ```python
+    import neat_panda
+
+    s1 = neat_panda.sketch(df1, on=["id"])
+    s2 = neat_panda.sketch(df2, on=["id"])
+    s1.intersection(s2)  # the approximate number of keys in both dataframes
+    ```
+    """
+    result = Sketch(precision=precision, on=on)
+    chunks = [data] if isinstance(data, pd.DataFrame) else data
+    for chunk in chunks:
+        result.update(chunk)
+    return result
+
+
+@dataclass(eq=False)
+class Sketch:
+    """A HyperLogLog sketch of the distinct rows, or keys, of one or more dataframes. Use the function sketch to
+    build one.
+
+    The rows are fingerprinted independently of the dtypes of the chunks, i.e. sketches of dataframes whose columns
+    got different dtypes (e.g. int64 and float64) are comparable. Two sketches can only be combined if they have the
+    same precision and key columns.
+
+    Parameters
+    ----------
+    precision : int, default 14\n
+        See sketch
+    on : Optional[List[str]], default None\n
+        See sketch
+    registers : Optional[np.ndarray], default None\n
+        The registers of the sketch. By default None, i.e. an empty sketch.
+    """
+
+    precision: int = 14
+    on: Optional[List[str]] = None
+    registers: np.ndarray = field(default=None)
+
+    def __post_init__(self):
+        if not isinstance(self.precision, int) or not 4 <= self.precision <= 18:
+            raise ValueError("precision must be an integer between 4 and 18")
+        if self.registers is None:
+            self.registers = np.zeros(2 ** self.precision, dtype=np.uint8)
+
+    def update(self, df: pd.DataFrame) -> "Sketch":
+        """Adds the rows of a dataframe to the sketch, which is updated in place.
+
+        Parameters
+        ----------
+        df : pd.DataFrame\n
+
+        Returns
+        -------
+        Sketch\n
+            The sketch itself
+
+        Raises
+        ------
+        KeyError\n
+            Raises KeyError if any of the key columns is not a column of the dataframe.
+        """
+        if self.on:
+            missing = [column for column in self.on if column not in df.columns]
+            if missing:
+                raise KeyError(
+                    f"The following key columns are not found in the dataframe: {', '.join(map(str, missing))}"
+                )
+            df = df[self.on]
+        if not len(df):
+            return self
+        fingerprints = _mix_fingerprints(_stable_fingerprints(df), _SKETCH_SEED)
+        suffix_bits = 64 - self.precision
+        registers = (fingerprints >> np.uint64(suffix_bits)).astype(np.intp)
+        suffix = fingerprints & np.uint64((1 << suffix_bits) - 1)
+        ranks = (suffix_bits - _bit_length(suffix) + 1).astype(np.uint8)
+        maximum = pd.Series(ranks).groupby(registers).max()
+        index = maximum.index.to_numpy()
+        self.registers[index] = np.maximum(self.registers[index], maximum.to_numpy())
+        return self
+
+    def count(self) -> float:
+        """Returns the estimated number of distinct rows (or keys) of the sketch.
+        """
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(int)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * np.log(m / zeros)
+        return float(estimate)
+
+    def merge(self, other: "Sketch") -> "Sketch":
+        """Returns a new sketch of the union of the rows of both sketches.
+
+        Parameters
+        ----------
+        other : Sketch\n
+
+        Returns
+        -------
+        Sketch\n
+
+        Raises
+        ------
+        ValueError\n
+            Raises ValueError if the sketches have different precision or key columns.
+        """
+        self._check_compatible(other)
+        return Sketch(
+            precision=self.precision,
+            on=self.on,
+            registers=np.maximum(self.registers, other.registers),
+        )
+
+    def union(self, other: "Sketch") -> float:
+        """Returns the estimated number of distinct rows in the union of both sketches.
+        """
+        return self.merge(other).count()
+
+    def intersection(self, other: "Sketch") -> float:
+        """Returns the estimated number of distinct rows that are in both sketches, by inclusion-exclusion. The
+        absolute error is about that of the union, hence small intersections of large sets are imprecise.
+        """
+        return max(self.count() + other.count() - self.union(other), 0.0)
+
+    def difference(self, other: "Sketch") -> float:
+        """Returns the estimated number of distinct rows that are in this sketch but not in other.
+        """
+        return max(self.union(other) - other.count(), 0.0)
+
+    def jaccard(self, other: "Sketch") -> float:
+        """Returns the estimated Jaccard similarity, i.e. the size of the intersection divided by the size of the
+        union.
+        """
+        union = self.union(other)
+        return self.intersection(other) / union if union else 0.0
+
+    def __or__(self, other: "Sketch") -> "Sketch":
+        return self.merge(other)
+
+    def __len__(self) -> int:
+        return int(round(self.count()))
+
+    def _check_compatible(self, other: Any) -> None:
+        if not isinstance(other, Sketch):
+            raise TypeError("Only sketches can be combined")
+        if self.precision != other.precision:
+            raise ValueError("The sketches must have the same precision")
+        if (self.on or None) != (other.on or None):
+            raise ValueError("The sketches must have the same key columns")
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """Returns the number of bits needed to represent each unsigned 64-bit integer, exactly and vectorized.
+    """
+    length = np.zeros(len(values), dtype=np.int64)
+    values = values.copy()
+    for shift in (32, 16, 8, 4, 2, 1):
+        large = values >= np.uint64(1 << shift)
+        length[large] += shift
+        values[large] >>= np.uint64(shift)
+    return length + (values > 0)
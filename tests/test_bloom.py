@@ -0,0 +1,77 @@
+import pytest
+import pandas as pd
+import numpy as np
+
+from neat_panda import BloomFilter, difference, intersection
+
+
+class TestBloomFilter:
+    @pytest.fixture()
+    def reference(self):
+        return pd.DataFrame({"id": np.arange(10_000), "value": "a"})
+
+    @pytest.fixture()
+    def batch(self):
+        return pd.DataFrame(
+            {"id": [9_998, 9_999, 10_000, 10_000, 5], "value": ["a", "a", "a", "a", "b"]}
+        )
+
+    @pytest.fixture()
+    def bloom(self, reference):
+        bloom = BloomFilter.create(len(reference))
+        for i in range(0, len(reference), 3_000):
+            bloom.add(reference.iloc[i : i + 3_000])
+        return bloom
+
+    def chunks(self, reference):
+        return (reference.iloc[i : i + 3_000] for i in range(0, len(reference), 3_000))
+
+    def test_no_false_negatives(self, bloom, reference):
+        assert bloom.contains(reference).all()
+
+    def test_false_positive_rate(self, bloom):
+        other = pd.DataFrame({"id": np.arange(10_000, 30_000), "value": "a"})
+        assert bloom.contains(other).mean() < 0.03
+
+    def test_same_result_as_set_operations(self, bloom, reference, batch):
+        with pytest.warns(UserWarning):
+            expected = difference(batch, reference)
+        assert bloom.difference(batch, self.chunks(reference)).equals(expected)
+        with pytest.warns(UserWarning):
+            expected = intersection(batch, reference)
+        result = bloom.intersection(batch, self.chunks(reference))
+        assert result.reset_index(drop=True).equals(expected)
+
+    def test_reference_not_read_without_candidates(self, bloom):
+        def reference():
+            raise AssertionError("the reference must not be read")
+            yield
+
+        batch = pd.DataFrame({"id": [-1], "value": ["x"]})
+        bloom.contains = lambda batch: np.zeros(len(batch), dtype=bool)
+        assert bloom.difference(batch, reference()).equals(batch)
+
+    def test_dtypes_independent(self, bloom, reference):
+        assert bloom.contains(reference.astype({"id": float})).all()
+
+    def test_on(self, reference, batch):
+        bloom = BloomFilter.create(len(reference), on=["id"]).add(reference)
+        result = bloom.intersection(batch, reference)
+        assert result["id"].tolist() == [9_998, 9_999, 5]
+
+    def test_columns_must_match(self, bloom):
+        with pytest.raises(ValueError):
+            bloom.contains(pd.DataFrame({"id": [1]}))
+
+    def test_save_load(self, bloom, batch, tmp_path):
+        bloom.save(tmp_path / "bloom")
+        loaded = BloomFilter.load(tmp_path / "bloom", mmap=True)
+        assert np.array_equal(loaded.contains(batch), bloom.contains(batch))
+        assert loaded.n_hashes == bloom.n_hashes
+        assert loaded.columns == bloom.columns
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            BloomFilter.create(0)
+        with pytest.raises(ValueError):
+            BloomFilter.create(100, error_rate=1.5)
@@ -1,9 +1,20 @@
 # noqa: E501
+import dataclasses
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 import pandas as pd
 import numpy as np
 
-from neat_panda import clean_column_names, clean_strings
+from neat_panda import (
+    clean_column_names,
+    clean_strings,
+    clean_column_names_cache_info,
+    clean_column_names_cache_clear,
+    CleanColumnNames,
+    ColumnNameCleaner,
+    ColumnNameMapping,
+)
 
 
 class TestsCleanColumns:
@@ -25,6 +36,13 @@ class TestsCleanColumns:
         assert df.columns.to_list() == nasty_columns
         assert df2.columns.to_list() == clean_columns
 
+    def test_assert_dataframe_data_not_copied(self, nasty_columns, clean_columns):
+        df = pd.DataFrame(np.random.randint(0, 5, size=(5, 12)), columns=nasty_columns)
+        df2 = df.clean_column_names()
+        assert df2.columns.to_list() == clean_columns
+        assert df.columns.to_list() == nasty_columns
+        assert np.shares_memory(df.values, df2.values)
+
     def test_assert_correct_result_basic(self, nasty_columns, clean_columns):
         assert clean_column_names(nasty_columns, case="snake") == clean_columns
 
@@ -213,3 +231,190 @@ class TestsCleanColumns:
         assert df.a.clean_column_names().equals(df2.a)
         assert df.a.clean_strings().equals(df2.a)
         assert df3.a.clean_strings().dtype.__str__() == "string"
+
+    def test_assert_correct_result_custom_multi_character(self):
+        a = ["ÅrTal", "Söder-Län", "straße"]
+        b = ["aar_tal", "soeder_laen", "strasse"]
+        c = clean_column_names(
+            a,
+            basic_cleaning=False,
+            custom_transformation={"Å": "Aa", "ö": "oe", "ä": "ae", "ß": "ss", "-L": "_L"},
+        )
+        assert c == b
+
+    def test_assert_custom_transformation_single_pass(self):
+        c = clean_column_names(
+            ["ab", "abc"],
+            basic_cleaning=False,
+            custom_transformation={"a": "b", "b": "c", "abc": "x"},
+            case=None,
+        )
+        assert c == ["bc", "x"]
+
+    def test_assert_cache(self, nasty_columns, clean_columns, dataframe_long):
+        clean_column_names_cache_clear()
+        assert clean_column_names(nasty_columns, cache=True) == clean_columns
+        assert clean_column_names(nasty_columns, cache=True) == clean_columns
+        df = dataframe_long.copy()
+        df.columns = nasty_columns[:4]
+        assert df.clean_column_names(cache=True).columns.to_list() == clean_column_names(
+            nasty_columns[:4]
+        )
+        info = clean_column_names_cache_info()
+        assert (info.hits, info.misses, info.currsize) == (1, 2, 2)
+        clean_column_names(nasty_columns, case="camel", cache=True)
+        assert clean_column_names_cache_info().misses == 3
+
+    def test_assert_cache_label_types(self):
+        clean_column_names_cache_clear()
+        assert clean_column_names([1], cache=True) == ["1"]
+        assert clean_column_names([True], cache=True) == clean_column_names([True])
+        assert clean_column_names([1.0], cache=True) == clean_column_names([1.0])
+        assert clean_column_names_cache_info().misses == 3
+
+    def test_assert_rename_mapping(self, tmp_path, nasty_columns, clean_columns):
+        df = pd.DataFrame(np.random.randint(0, 5, size=(5, 12)), columns=nasty_columns)
+        mapping = CleanColumnNames(df).rename_mapping()
+        assert "country" not in mapping.mapping
+        assert mapping.mapping["1"] == "1"
+        assert mapping.mapping["Name    "] == "name1"
+        path = tmp_path / "columns.json"
+        mapping.to_json(str(path))
+        loaded = ColumnNameMapping.from_json(str(path))
+        assert loaded == mapping
+        df2 = df.drop(columns=["country"])
+        assert loaded.apply(df2).columns.to_list() == [
+            i for i in clean_columns if i not in ["country1", "country2"]
+        ]
+        assert loaded.apply(df).columns.to_list() == clean_columns
+        assert df.columns.to_list() == nasty_columns
+
+    def test_assert_rename_mapping_fallback(self):
+        mapping = CleanColumnNames(["CountryName", "Region"]).rename_mapping()
+        assert mapping.apply(["CountryName", "subRegion"]) == [
+            "country_name",
+            "sub_region",
+        ]
+
+    def test_assert_correct_result_case_tokenizer(self):
+        a = ["a1B2C", "country___Name", "_sub_region_", "ACTUAL", ""]
+        c = clean_column_names(a, basic_cleaning=False, convert_duplicates=False)
+        assert c == ["a1_b2_c", "country_name", "_sub_region_", "actual", ""]
+        c = clean_column_names(
+            a, case="camel", basic_cleaning=False, convert_duplicates=False
+        )
+        assert c == ["a1B2C", "countryName", "SubRegion_", "actual", ""]
+        c = clean_column_names(
+            a, case="pascal", basic_cleaning=False, convert_duplicates=False
+        )
+        assert c == ["A1B2C", "CountryName", "SubRegion_", "Actual", ""]
+
+    @pytest.mark.parametrize(
+        "expression",
+        [
+            "__import__('os').system('ls')",
+            "column.__class__",
+            "re.compile('a')",
+            "open('file').read()",
+            "'{0.__class__}'.format(column)",
+            "column +",
+        ],
+    )
+    def test_assert_custom_expressions_not_allowed(self, expression):
+        with pytest.raises(ValueError):
+            CleanColumnNames(["a"], custom_expressions=[expression])
+
+    def test_assert_correct_result_custom_callable(self):
+        a = ["-Hello-", "Goodbye?"]
+        c = clean_column_names(
+            a,
+            custom_expressions=[
+                lambda column: column.upper(),
+                "re.sub('L+', lambda match: match.group(0).lower(), column)",
+            ],
+        )
+        assert c == ["hell_o", "goodbye"]
+
+    def test_assert_cleaner_reusable(self, nasty_columns, clean_columns, nasty_columns2):
+        cleaner = ColumnNameCleaner()
+        columns = list(nasty_columns)
+        assert cleaner.clean(columns) == clean_columns
+        assert cleaner.clean(columns) == clean_columns
+        assert columns == nasty_columns
+        assert cleaner.clean(pd.Index(nasty_columns)) == clean_columns
+        assert cleaner.clean(nasty_columns2[0]) == "country_name"
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            cleaner.case = "camel"
+
+    def test_assert_cleaner_threads(self, nasty_columns, clean_columns):
+        cleaner = ColumnNameCleaner()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(cleaner.clean, [nasty_columns] * 50))
+        assert all(result == clean_columns for result in results)
+
+    def test_assert_cleaner_options_frozen(self):
+        transformation = {"a": "b", "c": "d"}
+        expressions = ["column.upper()"]
+        cleaner = ColumnNameCleaner(
+            basic_cleaning=False,
+            custom_transformation=transformation,
+            custom_expressions=expressions,
+            case=None,
+        )
+        transformation["a"] = "x"
+        expressions.append("column + '_'")
+        assert cleaner.clean(["ac"]) == ["BD"]
+        assert cleaner == ColumnNameCleaner(
+            basic_cleaning=False,
+            custom_transformation={"a": "b", "c": "d"},
+            custom_expressions=["column.upper()"],
+            case=None,
+        )
+        reordered = ColumnNameCleaner(
+            basic_cleaning=False, custom_transformation={"c": "d", "a": "b"}, case=None
+        )
+        original = ColumnNameCleaner(
+            basic_cleaning=False, custom_transformation={"a": "b", "c": "d"}, case=None
+        )
+        assert reordered == original and hash(reordered) == hash(original)
+
+    def test_assert_cleaner_invalid_options(self):
+        with pytest.raises(KeyError):
+            ColumnNameCleaner(custom_transformation={"-": "_"})
+        with pytest.raises(KeyError):
+            ColumnNameCleaner(case="kebab")
+
+    def test_assert_correct_result_multi_index(self, dataframe_long):
+        df = dataframe_long.rename(columns={"country": "Country Name"}).pivot_table(
+            index="continent", columns=["Country Name", "year"], values=["actual"]
+        )
+        df2 = df.clean_column_names()
+        assert df2.columns.to_list() == [
+            ("actual", "denmark", "2018"),
+            ("actual", "sweden", "2018"),
+            ("actual", "sweden", "2019"),
+        ]
+        assert df2.columns.names == df.columns.names
+        assert df.columns.get_level_values(1).to_list()[0] == "Denmark"
+
+    def test_assert_correct_result_multi_index_duplicates(self):
+        columns = pd.MultiIndex.from_tuples(
+            [("Actual", "Sweden"), ("actual", "Sweden"), ("ACTUAL", np.nan)]
+        )
+        cleaned = clean_column_names(columns, convert_duplicates=False)
+        assert cleaned.to_list()[:2] == [("actual", "sweden"), ("actual", "sweden")]
+        assert pd.isna(cleaned.to_list()[2][1])
+        cleaned = clean_column_names(columns)
+        assert cleaned.get_level_values(0).to_list() == ["actual1", "actual2", "actual"]
+
+    def test_assert_multi_index_duplicates_in_column_order(self):
+        columns = pd.MultiIndex.from_tuples([("Sales Total", "2019"), ("sales_total", "2020")])
+        assert clean_column_names(columns).to_list() == [
+            ("sales_total", "2019"),
+            ("sales_total", "2020"),
+        ]
+        columns = pd.MultiIndex.from_tuples([("b", "x"), ("B", "y")])
+        assert clean_column_names(columns).get_level_values(0).to_list() == ["b", "b"]
+        columns = pd.MultiIndex.from_tuples([("b", "x"), ("B", "x")])
+        assert clean_column_names(columns).get_level_values(0).to_list() == ["b1", "b2"]
+        assert clean_column_names(["b", "B"]) == ["b1", "b2"]
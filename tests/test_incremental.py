@@ -0,0 +1,107 @@
+import pytest
+import pandas as pd
+import numpy as np
+
+from neat_panda import IncrementalDifference, IncrementalUnion, difference, union
+
+
+class TestIncremental:
+    @pytest.fixture()
+    def batches(self):
+        rng = np.random.default_rng(0)
+        return [
+            pd.DataFrame({"id": rng.integers(0, 50, 30), "value": rng.integers(0, 2, 30)})
+            for _ in range(6)
+        ]
+
+    def test_difference_same_as_recomputed(self, batches):
+        incremental = IncrementalDifference()
+        result = pd.DataFrame(columns=["id", "value"])
+        for i, batch in enumerate(batches):
+            if i % 2:
+                removed = incremental.add_right(batch)
+                result = difference(result, removed) if len(result) else result
+            else:
+                result = pd.concat([result, incremental.add_left(batch)])
+        left = pd.concat(batches[::2]).drop_duplicates()
+        right = pd.concat(batches[1::2])
+        expected = left.merge(right.drop_duplicates(), how="left", indicator=True)
+        expected = expected[expected._merge == "left_only"].drop(columns="_merge")
+        assert sorted(map(tuple, result.astype(int).to_numpy())) == sorted(
+            map(tuple, expected.to_numpy())
+        )
+
+    def test_difference_deltas(self):
+        incremental = IncrementalDifference()
+        incremental.add_right(pd.DataFrame({"id": [1, 2]}))
+        added = incremental.add_left(pd.DataFrame({"id": [2, 3, 3, 4]}))
+        assert added.id.to_list() == [3, 4]
+        assert incremental.add_left(pd.DataFrame({"id": [3, 5]})).id.to_list() == [5]
+        removed = incremental.add_right(pd.DataFrame({"id": [4, 4, 1, 6]}))
+        assert removed.id.to_list() == [4]
+        assert incremental.add_right(pd.DataFrame({"id": [4]})).empty
+
+    def test_difference_on(self):
+        incremental = IncrementalDifference(on=["id"])
+        incremental.add_right(pd.DataFrame({"id": [1], "value": ["a"]}))
+        added = incremental.add_left(
+            pd.DataFrame({"id": [1, 2, 2, 2], "value": ["b", "c", "d", "d"]})
+        )
+        assert added.value.to_list() == ["c", "d"]
+        removed = incremental.add_right(pd.DataFrame({"id": [2, 2], "value": ["x", "y"]}))
+        assert removed.value.to_list() == ["x"]
+
+    def test_dtypes_independent(self):
+        incremental = IncrementalDifference()
+        incremental.add_right(pd.DataFrame({"id": [1, 2]}))
+        assert incremental.add_left(pd.DataFrame({"id": [1.0, 3.0]})).id.to_list() == [3.0]
+
+    def test_large_integers(self):
+        incremental = IncrementalDifference()
+        incremental.add_right(pd.DataFrame({"id": [2 ** 53]}))
+        added = incremental.add_left(pd.DataFrame({"id": [2 ** 53 + 1, 2 ** 53 + 2]}))
+        assert added.id.to_list() == [2 ** 53 + 1, 2 ** 53 + 2]
+        union = IncrementalUnion()
+        union.add(pd.DataFrame({"id": [2 ** 53]}))
+        assert union.add(pd.DataFrame({"id": [2 ** 53 + 1]})).id.to_list() == [2 ** 53 + 1]
+        union = IncrementalUnion()
+        union.add(pd.DataFrame({"id": np.array([2 ** 63 + 1], dtype=np.uint64)}))
+        added = union.add(pd.DataFrame({"id": np.array([2 ** 63 + 2, 2 ** 63], dtype=np.uint64)}))
+        assert added.id.to_list() == [2 ** 63 + 2, 2 ** 63]
+        assert union.add(pd.DataFrame({"id": [float(2 ** 63)]})).empty
+
+    def test_nan_and_negative_zero_variants(self):
+        incremental = IncrementalUnion()
+        incremental.add(pd.DataFrame({"a": [np.nan, 0.0]}))
+        variants = np.array([0.0, -0.0]) / np.array([0.0, 1.0])
+        assert incremental.add(pd.DataFrame({"a": variants})).empty
+
+    def test_columns_must_match(self):
+        incremental = IncrementalDifference()
+        incremental.add_left(pd.DataFrame({"id": [1]}))
+        with pytest.raises(ValueError):
+            incremental.add_right(pd.DataFrame({"key": [1]}))
+        with pytest.raises(KeyError):
+            IncrementalUnion(on=["key"]).add(pd.DataFrame({"id": [1]}))
+
+    def test_union_same_as_recomputed(self, batches):
+        incremental = IncrementalUnion()
+        result = pd.concat([incremental.add(batch) for batch in batches])
+        with pytest.warns(UserWarning):
+            expected = union(pd.concat(batches[:3]), pd.concat(batches[3:]), distinct=True)
+        assert result.reset_index(drop=True).equals(expected)
+
+    def test_union_on(self):
+        incremental = IncrementalUnion(on=["id"])
+        incremental.add(pd.DataFrame({"id": [1], "value": ["a"]}))
+        added = incremental.add(pd.DataFrame({"id": [1, 2], "value": ["b", "c"]}))
+        assert added.value.to_list() == ["c"]
+
+    def test_fingerprint_set_levels(self):
+        incremental = IncrementalUnion()
+        for start in range(0, 1000, 10):
+            incremental.add(pd.DataFrame({"id": np.arange(start, start + 20)}))
+        levels = incremental._keys.levels
+        assert sum(map(len, levels)) == 1010
+        assert len(levels) <= 11
+        assert all(np.all(np.diff(level.astype(np.float64)) >= 0) for level in levels)
@@ -0,0 +1,82 @@
+import pytest
+import pandas as pd
+import numpy as np
+
+from neat_panda import PartitionedSetOperations, SetOperations
+
+
+def _sorted(df):
+    return df.sort_values(df.columns.to_list()).reset_index(drop=True)
+
+
+class TestPartitionedSetOperations:
+    @pytest.fixture()
+    def dataframes(self):
+        rng = np.random.default_rng(0)
+        df1 = pd.DataFrame({"id": np.arange(2000), "value": rng.integers(0, 3, 2000)})
+        df2 = pd.DataFrame(
+            {"id": np.arange(1000, 3000), "value": rng.integers(0, 3, 2000)}
+        )
+        return df1, df2
+
+    @pytest.mark.parametrize(
+        "operation", ["difference", "intersection", "symmetric_difference", "union"]
+    )
+    def test_same_result_as_set_operations(self, dataframes, operation):
+        df1, df2 = dataframes
+        chunks = PartitionedSetOperations(
+            df1, df2, n_partitions=4, chunksize=300
+        ).__getattribute__(operation)()
+        expected = getattr(SetOperations(df1, df2), operation)()
+        assert _sorted(pd.concat(chunks)).equals(_sorted(expected))
+
+    def test_on_and_iterators(self, dataframes):
+        df1, df2 = dataframes
+        chunks1 = (df1.iloc[i : i + 500] for i in range(0, len(df1), 500))
+        chunks2 = [df2.iloc[:700], df2.iloc[700:]]
+        result = pd.concat(
+            PartitionedSetOperations(chunks1, chunks2, on=["id"]).difference()
+        )
+        assert sorted(result.id) == list(range(1000))
+
+    def test_memory_budget_repartitions(self, dataframes, tmp_path):
+        df1, df2 = dataframes
+        operations = PartitionedSetOperations(
+            df1, df2, memory_budget=2000, n_partitions=2, temporary_directory=tmp_path
+        )
+        chunks = list(operations.intersection())
+        assert len(chunks) > 2
+        expected = SetOperations(df1, df2).intersection()
+        assert _sorted(pd.concat(chunks)).equals(_sorted(expected))
+        assert not any(tmp_path.iterdir())
+
+    def test_csv_source_and_target(self, dataframes, tmp_path):
+        df1, df2 = dataframes
+        df1.to_csv(tmp_path / "df1.csv", index=False)
+        target = tmp_path / "result.csv"
+        PartitionedSetOperations(tmp_path / "df1.csv", df2, chunksize=128).difference(
+            target=target
+        )
+        expected = SetOperations(df1, df2).difference()
+        assert _sorted(pd.read_csv(target)).equals(_sorted(expected))
+
+    def test_parquet_target(self, dataframes, tmp_path):
+        pytest.importorskip("pyarrow")
+        df1, df2 = dataframes
+        target = tmp_path / "result.parquet"
+        PartitionedSetOperations(df1, df2).union(target=target)
+        expected = SetOperations(df1, df2).union()
+        assert _sorted(pd.read_parquet(target)).equals(_sorted(expected))
+
+    def test_duplicates_warned_once(self, dataframes):
+        df1, df2 = dataframes
+        df1 = pd.concat([df1, df1])
+        with pytest.warns(UserWarning) as record:
+            list(PartitionedSetOperations(df1, df2, n_partitions=4).difference())
+        assert len(record) == 1
+        assert "2000 duplicate rows in source1" in str(record[0].message)
+
+    def test_different_number_of_columns(self, dataframes):
+        df1, df2 = dataframes
+        with pytest.raises(ValueError):
+            list(PartitionedSetOperations(df1, df2[["id"]]).difference())
@@ -0,0 +1,62 @@
+import io
+
+import pytest
+import pandas as pd
+
+from neat_panda import read_csv_clean, read_excel_clean, read_parquet_clean
+
+
+@pytest.fixture()
+def messy_dataframe():
+    return pd.DataFrame(
+        data={
+            "CountryName": ["Sweden", "Sweden", "Denmark"],
+            "Continent  ": ["Europe", "Europe", "Not known"],
+            "yearNo": [2018, 2019, 2018],
+            "ACTUAL$": [1, 2, 3],
+        }
+    )
+
+
+@pytest.fixture()
+def clean_dataframe(messy_dataframe):
+    return messy_dataframe.clean_column_names()
+
+
+class TestsReaders:
+    def test_read_csv_clean(self, tmp_path, messy_dataframe, clean_dataframe):
+        path = tmp_path / "messy.csv"
+        messy_dataframe.to_csv(path, index=False)
+        assert read_csv_clean(path).equals(clean_dataframe)
+
+    def test_read_csv_clean_columns(self, messy_dataframe, clean_dataframe):
+        buffer = io.StringIO(messy_dataframe.to_csv(index=False))
+        df = read_csv_clean(buffer, columns=["actual", "country_name"])
+        assert df.equals(clean_dataframe[["country_name", "actual"]])
+
+    def test_read_csv_clean_missing_column(self, messy_dataframe):
+        buffer = io.StringIO(messy_dataframe.to_csv(index=False))
+        with pytest.raises(KeyError):
+            read_csv_clean(buffer, columns=["CountryName"])
+
+    def test_read_csv_clean_camel(self, messy_dataframe):
+        buffer = io.StringIO(messy_dataframe.to_csv(index=False))
+        df = read_csv_clean(buffer, case="camel", dtype={"yearNo": "float"})
+        assert df.columns.to_list() == ["countryName", "continent", "yearNo", "actual"]
+        assert df.yearNo.dtype == "float"
+
+    def test_read_excel_clean(self, tmp_path, messy_dataframe, clean_dataframe):
+        pytest.importorskip("openpyxl")
+        path = tmp_path / "messy.xlsx"
+        messy_dataframe.to_excel(path, index=False)
+        assert read_excel_clean(path).equals(clean_dataframe)
+        df = read_excel_clean(path, columns=["year_no"])
+        assert df.equals(clean_dataframe[["year_no"]])
+
+    def test_read_parquet_clean(self, tmp_path, messy_dataframe, clean_dataframe):
+        pytest.importorskip("pyarrow")
+        path = tmp_path / "messy.parquet"
+        messy_dataframe.to_parquet(path)
+        assert read_parquet_clean(path).equals(clean_dataframe)
+        df = read_parquet_clean(path, columns=["continent", "actual"])
+        assert df.equals(clean_dataframe[["continent", "actual"]])
@@ -0,0 +1,50 @@
+import pytest
+import pandas as pd
+import numpy as np
+
+from neat_panda import SetIndex, difference, intersection
+
+
+class TestSetIndex:
+    @pytest.fixture()
+    def reference(self):
+        return pd.DataFrame({"id": [1, 2, 3, 4], "value": ["a", "b", "c", "d"]})
+
+    @pytest.fixture()
+    def batch(self):
+        return pd.DataFrame({"id": [3, 4, 5, 5], "value": ["c", "x", "e", "e"]})
+
+    def test_same_result_as_set_operations(self, reference, batch):
+        index = SetIndex.from_dataframe(reference)
+        with pytest.warns(UserWarning):
+            assert index.difference(batch).equals(difference(batch, reference))
+        with pytest.warns(UserWarning):
+            assert (
+                index.intersection(batch)
+                .reset_index(drop=True)
+                .equals(intersection(batch, reference))
+            )
+
+    def test_on(self, reference, batch):
+        index = SetIndex.from_dataframe(reference, on=["id"])
+        assert index.contains(batch).tolist() == [True, True, False, False]
+        assert index.contains(batch[["id"]]).tolist() == [True, True, False, False]
+
+    def test_cast_to_reference_dtypes(self, reference):
+        index = SetIndex.from_dataframe(reference, on=["id"])
+        batch = pd.DataFrame({"id": [1.0, 1.5, np.nan, 4.0]})
+        assert index.contains(batch).tolist() == [True, False, False, True]
+
+    def test_columns_must_match(self, reference, batch):
+        index = SetIndex.from_dataframe(reference)
+        with pytest.raises(ValueError):
+            index.contains(batch[["id"]])
+        with pytest.raises(KeyError):
+            SetIndex.from_dataframe(reference, on=["key"])
+
+    def test_save_and_load(self, reference, batch, tmp_path):
+        SetIndex.from_dataframe(reference, on=["id"]).save(tmp_path / "index")
+        index = SetIndex.load(tmp_path / "index")
+        assert isinstance(index.fingerprints, np.memmap)
+        assert len(index) == 4
+        assert index.difference(batch).id.tolist() == [5]
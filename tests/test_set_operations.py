@@ -3,6 +3,8 @@ import pandas as pd
 import numpy as np
 
 from neat_panda import difference, intersection, symmetric_difference, union
+from neat_panda import union_all, intersection_all, difference_all, diff
+from neat_panda import _helpers, _parallel
 
 
 class TestSetOperations:
@@ -126,7 +128,7 @@ class TestSetOperations:
                 "actual": [2, 3, 2, 3],
             }
         )
-        df3 = df1.append(df2).reset_index(drop=True)
+        df3 = pd.concat([df1, df2], ignore_index=True)
         assert union(df1, df2).equals(df3)
 
     def test_warning_duplicates(self):
@@ -147,4 +149,226 @@ class TestSetOperations:
             }
         )
         with pytest.warns(UserWarning):
-            union(df1, df2)
+            union(df1, df2, distinct=True)
+
+    def test_difference_mixed_dtypes(self, dataframe_long):
+        df2 = dataframe_long.astype({"year": "float"}).iloc[:2]
+        df3 = difference(dataframe_long, df2)
+        assert df3.equals(dataframe_long.iloc[2:])
+
+    def test_difference_fingerprint_collisions(self, dataframe_long, monkeypatch):
+        monkeypatch.setattr(
+            _helpers,
+            "_row_fingerprints",
+            lambda df, columns=None: np.zeros(len(df), dtype="uint64"),
+        )
+        monkeypatch.setattr(
+            "neat_panda._set_operations._row_fingerprints", _helpers._row_fingerprints
+        )
+        df2 = dataframe_long.iloc[[1]]
+        df3 = difference(dataframe_long, df2)
+        assert df3.equals(dataframe_long.iloc[[0, 2]])
+
+    def test_symmetric_difference_not_altered(self, dataframe_long):
+        df1 = dataframe_long.iloc[[0, 1]]
+        df2 = dataframe_long.iloc[[1, 2]].astype({"year": "float"})
+        df3 = symmetric_difference(df1, df2, dataframe_names=["a", "b"])
+        assert df3.original_dataframe.to_list() == ["a", "b"]
+        assert df3.year.to_list() == [2018, 2018]
+        assert df1.year.dtype == "int64" and df2.year.dtype == "float"
+
+    def test_nan_and_negative_zero_variants(self):
+        nan = np.array([0.0]) / np.array([0.0])
+        df1 = pd.DataFrame({"a": [1, 2, 3], "b": [nan[0], 1.0, -0.0]})
+        df2 = pd.DataFrame({"a": [1, 3], "b": [np.nan, 0.0]})
+        assert difference(df1, df2).a.to_list() == [2]
+        assert intersection(df1, df2).a.to_list() == [1, 3]
+        assert symmetric_difference(df1, df2).a.to_list() == [2]
+        assert len(union(df1, df2, distinct=True)) == 3
+        assert len(intersection_all([df1, df2, df2])) == 2
+        assert (diff(df2, df1, on=["a"]).change == "unchanged").sum() == 2
+
+    def test_duplicate_column_labels(self):
+        df1 = pd.DataFrame([[1, 2], [3, 4]], columns=["x", "x"])
+        df2 = pd.DataFrame([[1.0, 2.0]], columns=["x", "x"])
+        assert difference(df1, df2).values.tolist() == [[3, 4]]
+        assert intersection(df1, df2).values.tolist() == [[1, 2]]
+        assert symmetric_difference(df1, df2).values.tolist() == [[3, 4]]
+        assert union(df1, df2, distinct=True).values.tolist() == [[1, 2], [3, 4]]
+        assert intersection_all([df1, df2]).values.tolist() == [[1, 2]]
+        assert difference_all(df1, [df2]).values.tolist() == [[3, 4]]
+
+    def test_key_based_operations(self):
+        df1 = pd.DataFrame({"id": [1, 2, 3], "value": ["a", "b", "c"]})
+        df2 = pd.DataFrame({"id": [2, 3, 4], "value": ["b", "x", "d"]})
+        assert difference(df1, df2, on=["id"]).id.to_list() == [1]
+        assert difference(df1, df2).id.to_list() == [1, 3]
+        df3 = symmetric_difference(df1, df2, on=["id"])
+        assert df3.id.to_list() == [1, 4]
+        df4 = intersection(df1, df2, on=["id"], flag_conflicts=True)
+        assert df4.id.to_list() == [2, 3]
+        assert df4.payload_differs.to_list() == [False, True]
+        assert union(df1, df2, on=["id"]).value.to_list() == ["a", "b", "c", "d"]
+
+    def test_key_based_missing_column(self):
+        df1 = pd.DataFrame({"id": [1, 2, 3], "value": ["a", "b", "c"]})
+        with pytest.raises(KeyError):
+            difference(df1, df1, on=["key"])
+
+    @pytest.mark.parametrize(
+        "operation", [difference, intersection, symmetric_difference]
+    )
+    def test_n_jobs(self, operation):
+        rng = np.random.default_rng(0)
+        df1 = pd.DataFrame({"a": rng.integers(0, 50, 500), "b": rng.integers(0, 5, 500)})
+        df2 = pd.DataFrame({"a": rng.integers(0, 50, 500), "b": rng.integers(0, 5, 500)})
+        df1, df2 = df1.drop_duplicates(), df2.drop_duplicates()
+        assert operation(df1, df2, n_jobs=3).equals(operation(df1, df2))
+
+    def test_partition_order(self):
+        fingerprints = np.random.default_rng(0).integers(0, 2 ** 63, 1000).astype(np.uint64)
+        order, bounds = _parallel._partition_order(fingerprints, 3)
+        assert sorted(order) == list(range(1000)) and bounds[0] == 0 and bounds[-1] == 1000
+        for partition in range(3):
+            positions = order[bounds[partition] : bounds[partition + 1]]
+            assert (fingerprints[positions] % np.uint64(3) == partition).all()
+            assert (np.diff(positions) > 0).all()
+
+    def test_n_jobs_invalid(self, dataframe_long):
+        with pytest.raises(ValueError):
+            difference(dataframe_long, dataframe_long, n_jobs=0)
+
+    def test_columns_of_dataframe2_not_altered(self, dataframe_long):
+        df2 = dataframe_long.rename(columns={"actual": "value"}).iloc[[1, 2]]
+        with pytest.warns(UserWarning):
+            df3 = symmetric_difference(dataframe_long, df2)
+        assert df2.columns.to_list()[-1] == "value"
+        assert df3.columns.to_list() == dataframe_long.columns.to_list()
+
+    def test_duplicates_fingerprinted_once(self, dataframe_long, monkeypatch):
+        calls = []
+        fingerprints = _helpers._row_fingerprints
+
+        def _counting(df, columns=None):
+            calls.append(len(df))
+            return fingerprints(df, columns)
+
+        monkeypatch.setattr("neat_panda._set_operations._row_fingerprints", _counting)
+        df1 = pd.concat([dataframe_long, dataframe_long.iloc[[0]]])
+        with pytest.warns(UserWarning, match="1 duplicate rows in dataframe1"):
+            df3 = difference(df1, dataframe_long.iloc[[2]])
+        assert calls == [4, 1]
+        assert df3.equals(dataframe_long.iloc[[0, 1]])
+
+    def test_assume_unique(self, dataframe_long, recwarn):
+        df3 = difference(dataframe_long, dataframe_long.iloc[[1]], assume_unique=True)
+        assert df3.equals(dataframe_long.iloc[[0, 2]])
+        df4 = intersection(
+            dataframe_long, dataframe_long.iloc[[1]], on=["country"], assume_unique=True
+        )
+        assert df4.country.to_list() == ["Sweden", "Sweden"]
+        assert len(recwarn) == 0
+
+    def test_multiway_operations(self, dataframe_long):
+        df1 = dataframe_long
+        df2 = dataframe_long.iloc[[1, 2]].astype({"year": "float"})
+        df3 = pd.concat([dataframe_long.iloc[[2, 2, 1]], dataframe_long.iloc[[0]].assign(year=2020)])
+        frames = [df1, df2, df3]
+        assert intersection_all(frames).equals(dataframe_long.iloc[[1, 2]].reset_index(drop=True))
+        df4 = union_all(frames)
+        assert len(df4) == 4 and df4.year.to_list()[-1] == 2020
+        assert len(union_all(frames, distinct=False)) == 9
+        assert difference_all(df1, [df2, df3]).equals(dataframe_long.iloc[[0]])
+        assert difference_all(df1, []).equals(df1)
+
+    def test_multiway_fingerprint_collisions(self, dataframe_long, monkeypatch):
+        monkeypatch.setattr(
+            "neat_panda._set_operations._row_fingerprints",
+            lambda df, columns=None: np.zeros(len(df), dtype="uint64"),
+        )
+        frames = [dataframe_long, dataframe_long.iloc[[2, 1]]]
+        assert intersection_all(frames).equals(dataframe_long.iloc[[1, 2]].reset_index(drop=True))
+        assert len(union_all(frames)) == 3
+        assert difference_all(dataframe_long, frames[1:]).equals(dataframe_long.iloc[[0]])
+
+    def test_union_distinct(self, dataframe_long):
+        df2 = pd.concat([dataframe_long.iloc[[2, 2]], dataframe_long.iloc[[0]].assign(year=2020)])
+        with pytest.warns(UserWarning):
+            df3 = union(dataframe_long, df2, distinct=True)
+        assert df3.year.to_list() == [2018, 2019, 2018, 2020]
+        df4 = union(dataframe_long, df2, ignore_index=False)
+        assert df4.index.to_list() == [0, 1, 2, 2, 2, 0]
+
+    @pytest.mark.parametrize("on", [None, ["a"], ["a", "b"]])
+    def test_assume_sorted(self, on):
+        rng = np.random.default_rng(0)
+        df1 = pd.DataFrame({"a": rng.integers(0, 20, 200), "b": rng.choice(list("xyz"), 200)})
+        df2 = pd.DataFrame({"a": rng.integers(0, 20, 200), "b": rng.choice(list("xyz"), 200)})
+        df1 = df1.drop_duplicates().sort_values(["a", "b"]).reset_index(drop=True)
+        df2 = df2.drop_duplicates().sort_values(["a", "b"]).reset_index(drop=True)
+        assert difference(df1, df2, on=on, assume_sorted=True).equals(difference(df1, df2, on=on))
+        assert intersection(df1, df2, on=on, assume_sorted=True).equals(
+            intersection(df1, df2, on=on)
+        )
+
+    def test_assume_sorted_duplicates_and_unsorted(self, dataframe_long):
+        df1 = dataframe_long.sort_values(["country", "continent", "year"])
+        df1 = pd.concat([df1.iloc[[0]], df1]).reset_index(drop=True)
+        with pytest.warns(UserWarning, match="1 duplicate rows"):
+            df3 = difference(df1, df1.iloc[[0]], assume_sorted=True)
+        assert df3.equals(df1.iloc[[2, 3]])
+        with pytest.raises(ValueError):
+            difference(dataframe_long, dataframe_long, assume_sorted=True)
+
+    def test_mask_and_return_indexer(self, dataframe_long):
+        df2 = dataframe_long.iloc[[1]]
+        mask = difference(dataframe_long, df2, mask=True)
+        assert mask.tolist() == [True, False, True]
+        assert dataframe_long[mask].equals(difference(dataframe_long, df2))
+        assert intersection(dataframe_long, df2, return_indexer=True).tolist() == [1]
+        mask1, mask2 = symmetric_difference(dataframe_long, df2, mask=True)
+        assert mask1.tolist() == [True, False, True] and mask2.tolist() == [False]
+        with pytest.raises(ValueError):
+            difference(dataframe_long, df2, mask=True, return_indexer=True)
+
+    def test_diff(self):
+        df_old = pd.DataFrame({"id": [1, 2, 3], "a": [1.0, 2.0, np.nan], "b": ["x", "y", "z"]})
+        df_new = pd.DataFrame({"id": [3, 1, 4], "a": [np.nan, 1.5, 4.0], "b": ["z", "q", "w"]})
+        df3 = diff(df_old, df_new, on=["id"])
+        assert df3.id.to_list() == [3, 1, 4, 2]
+        assert df3.change.to_list() == ["unchanged", "updated", "inserted", "deleted"]
+        assert df3.changed_columns.to_list() == [[], ["a", "b"], [], []]
+
+    def test_diff_fingerprint_collisions(self, monkeypatch):
+        monkeypatch.setattr(
+            "neat_panda._set_operations._row_fingerprints",
+            lambda df, columns=None: np.zeros(len(df), dtype="uint64"),
+        )
+        df_old = pd.DataFrame({"id": [1, 2], "a": [1, 2]})
+        df_new = pd.DataFrame({"id": [2, 3], "a": [5, 3]})
+        df3 = diff(df_old, df_new, on=["id"])
+        assert df3.change.to_list() == ["updated", "inserted", "deleted"]
+
+    def test_diff_duplicate_keys(self, dataframe_long):
+        with pytest.raises(ValueError):
+            diff(dataframe_long, dataframe_long, on=["country"])
+
+    def test_categories_unified(self):
+        df1 = pd.DataFrame({"c": pd.Categorical(["x", "y", "z", None]), "v": [1, 2, 3, 4]})
+        df2 = pd.DataFrame({"c": pd.Categorical(["w", "z", "y", None]), "v": [0, 3, 2, 4]})
+        assert difference(df1, df2).c.to_list() == ["x"]
+        assert intersection(df1, df2).v.to_list() == [2, 3, 4]
+        for df3 in [
+            union(df1, df2),
+            union(df1, df2, distinct=True),
+            symmetric_difference(df1, df2),
+            union_all([df1, df2]),
+        ]:
+            assert isinstance(df3.c.dtype, pd.CategoricalDtype)
+        assert union(df1, df2).c.cat.categories.to_list() == ["x", "y", "z", "w"]
+        assert df1.c.cat.categories.to_list() == ["x", "y", "z"]
+
+    def test_rows_equal_categorical_codes(self):
+        left = pd.DataFrame({"c": pd.Categorical(["a", None, "b"])})
+        right = pd.DataFrame({"c": pd.Categorical(["a", None, "a"], categories=["a", "b"])})
+        assert _helpers._rows_equal(left, right).tolist() == [True, True, False]
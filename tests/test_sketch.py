@@ -0,0 +1,65 @@
+import pytest
+import pandas as pd
+import numpy as np
+
+from neat_panda import sketch, Sketch
+
+
+class TestSketch:
+    @pytest.fixture()
+    def df1(self):
+        return pd.DataFrame({"id": np.arange(100_000), "value": "a"})
+
+    @pytest.fixture()
+    def df2(self):
+        return pd.DataFrame({"id": np.arange(50_000, 150_000), "value": "a"})
+
+    def test_count(self, df1):
+        assert sketch(df1).count() == pytest.approx(100_000, rel=0.03)
+
+    def test_small_count(self):
+        df = pd.DataFrame({"id": [1, 2, 3, 3, 2]})
+        assert len(sketch(df)) == 3
+
+    def test_duplicates_are_counted_once(self, df1):
+        twice = pd.concat([df1, df1])
+        assert np.array_equal(sketch(twice).registers, sketch(df1).registers)
+
+    def test_chunks_same_as_single_pass(self, df1):
+        chunks = (df1.iloc[i : i + 7_000] for i in range(0, len(df1), 7_000))
+        assert np.array_equal(sketch(chunks).registers, sketch(df1).registers)
+
+    def test_merge_same_as_concatenation(self, df1, df2):
+        merged = sketch(df1) | sketch(df2)
+        assert np.array_equal(
+            merged.registers, sketch(pd.concat([df1, df2])).registers
+        )
+
+    def test_estimates(self, df1, df2):
+        s1, s2 = sketch(df1), sketch(df2)
+        assert s1.union(s2) == pytest.approx(150_000, rel=0.03)
+        assert s1.intersection(s2) == pytest.approx(50_000, rel=0.1)
+        assert s1.difference(s2) == pytest.approx(50_000, rel=0.1)
+        assert s1.jaccard(s2) == pytest.approx(1 / 3, rel=0.1)
+
+    def test_on(self, df1):
+        df = df1.assign(value=np.arange(len(df1)) % 3)
+        assert sketch(df, on=["value"]).count() == pytest.approx(3, abs=0.5)
+
+    def test_dtypes_independent(self):
+        df = pd.DataFrame({"id": [1, 2, 3]})
+        assert np.array_equal(
+            sketch(df).registers, sketch(df.astype(float)).registers
+        )
+
+    def test_precision_mismatch(self, df1):
+        with pytest.raises(ValueError):
+            sketch(df1, precision=12).merge(sketch(df1))
+
+    def test_key_mismatch(self, df1):
+        with pytest.raises(ValueError):
+            sketch(df1, on=["id"]).union(sketch(df1))
+
+    def test_invalid_precision(self):
+        with pytest.raises(ValueError):
+            Sketch(precision=2)